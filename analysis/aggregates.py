@@ -0,0 +1,188 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from utils.attendance_feed import CsvTail
+
+LOGS_CSV = "data/participation_logs.csv"
+
+
+class ParticipationAggregates(CsvTail):
+    """
+    Materialized summaries of participation_logs.csv, kept up to date
+    incrementally: each poll() only parses the rows appended since the last
+    one and adds them to
+      - per-event participation counts
+      - per-type (log event_type) counts
+      - a sparse student x event participation-count matrix
+    The raw rows themselves are not kept, so memory follows the number of
+    distinct (student, event) pairs, not the length of the log.
+    """
+
+    def __init__(self, path=LOGS_CSV):
+        super().__init__(path)
+
+    def _reset(self):
+        super()._reset()
+        self.student_ids = pd.Index([], dtype='int64')
+        self.event_ids = pd.Index([], dtype='int64')
+        self._event_counts = pd.Series(dtype='int64')
+        self._type_counts = pd.Series(dtype='int64')
+        self._matrix = sparse.csr_matrix((0, 0), dtype=np.int64)
+        self._pending = []      # (rows, cols) of ingested rows not yet folded into _matrix
+        self._sorted = None     # matrix() result, until new rows arrive
+
+    @staticmethod
+    def _extend(index, ids):
+        new = pd.Index(pd.unique(ids)).difference(index)
+        return index.append(new) if len(new) else index
+
+    def _ingest(self, new_rows):
+        self.student_ids = self._extend(self.student_ids, new_rows['student_id'])
+        self.event_ids = self._extend(self.event_ids, new_rows['event_id'])
+        self._pending.append((self.student_ids.get_indexer(new_rows['student_id']),
+                              self.event_ids.get_indexer(new_rows['event_id'])))
+        self._sorted = None
+
+        self._event_counts = self._event_counts.add(new_rows.groupby('event_id').size(), fill_value=0).astype('int64')
+        if 'event_type' in new_rows.columns:
+            self._type_counts = self._type_counts.add(new_rows.groupby('event_type').size(), fill_value=0).astype('int64')
+
+    def _fold(self):
+        # Fold pending rows in one COO -> CSR pass (duplicates are summed)
+        shape = (len(self.student_ids), len(self.event_ids))
+        if self._pending:
+            rows = np.concatenate([r for r, _ in self._pending])
+            cols = np.concatenate([c for _, c in self._pending])
+            added = sparse.coo_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=shape).tocsr()
+            self._matrix.resize(shape)
+            self._matrix = self._matrix + added
+            self._pending = []
+        return self._matrix
+
+    # ---------- Reads ----------
+    def event_counts(self):
+        """event_id -> number of participation rows."""
+        with self._lock:
+            return self._event_counts.sort_index()
+
+    def type_counts(self):
+        """Log event_type -> number of participation rows."""
+        with self._lock:
+            return self._type_counts.sort_values(ascending=False)
+
+    def matrix(self):
+        """(sparse student x event counts, student ids, event ids), rows/columns sorted by id."""
+        with self._lock:
+            if self._sorted is None:
+                matrix = self._fold()
+                student_order = np.argsort(self.student_ids.to_numpy(), kind='stable')
+                event_order = np.argsort(self.event_ids.to_numpy(), kind='stable')
+                self._sorted = (matrix[student_order][:, event_order],
+                                self.student_ids[student_order], self.event_ids[event_order])
+            return self._sorted
+
+    def participation_frame(self):
+        """Dense student x event counts; the same table logs.pivot_table(..., aggfunc='size') gives."""
+        matrix, students, events = self.matrix()
+        return pd.DataFrame(matrix.toarray(), index=students.rename('student_id'), columns=events.rename('event_id'))
+
+    @property
+    def version(self):
+        """Changes whenever new rows were ingested (a cache key for derived tables)."""
+        return self.offset, self.rows
+
+    def totals(self):
+        with self._lock:
+            return {"rows": self.rows, "students": len(self.student_ids), "events": len(self.event_ids)}
+
+
+# Heatmap groupings: dashboard label -> column of students.csv / events.csv
+# (None = bins of consecutive ids)
+STUDENT_GROUPS = {"Student ID": None, "Major": "major", "Year": "year", "Interests": "interests"}
+EVENT_GROUPS = {"Event ID": None, "Event Type": "event_type", "Month": "date"}
+
+
+def id_bins(ids, max_bins):
+    """Labels for sorted ids: the ids themselves if few enough, else ~max_bins equal-size ranges."""
+    ids = np.asarray(ids)
+    if len(ids) <= max_bins:
+        return ids.astype(str)
+    bin_of = np.arange(len(ids)) * max_bins // len(ids)
+    edges = np.flatnonzero(np.diff(bin_of)) + 1
+    starts, ends = np.r_[0, edges], np.r_[edges, len(ids)] - 1
+    labels = np.array([f"{ids[a]}-{ids[b]}" for a, b in zip(starts, ends)])
+    return labels[bin_of]
+
+
+def bin_matrix(matrix, row_labels, col_labels):
+    """
+    Sums a sparse matrix into (row label x column label) blocks with two
+    sparse indicator products, R @ M @ C.T, so only the small binned
+    table is ever dense. Labels keep their first-seen order.
+    """
+    row_codes, row_names = pd.factorize(pd.Series(row_labels))
+    col_codes, col_names = pd.factorize(pd.Series(col_labels))
+    R = sparse.csr_matrix((np.ones(len(row_codes), dtype=matrix.dtype), (row_codes, np.arange(len(row_codes)))),
+                          shape=(len(row_names), matrix.shape[0]))
+    C = sparse.csr_matrix((np.ones(len(col_codes), dtype=matrix.dtype), (col_codes, np.arange(len(col_codes)))),
+                          shape=(len(col_names), matrix.shape[1]))
+    return pd.DataFrame((R @ matrix @ C.T).toarray(), index=row_names, columns=col_names)
+
+
+def _group_labels(ids, table, key, column, max_bins):
+    """Per id, its group label from `table` (or an id bin when column is None)."""
+    if column is None:
+        return id_bins(ids, max_bins)
+    values = table.set_index(key)[column].reindex(ids)
+    if column == "date":
+        values = pd.to_datetime(values).dt.strftime("%Y-%m")
+    return values.astype(object).where(values.notna(), "Unknown").astype(str).to_numpy()
+
+
+def heatmap_table(aggregates, students, events, student_group="Student ID", event_group="Event ID", max_bins=60):
+    """
+    Participation counts binned by a student grouping (STUDENT_GROUPS) and an
+    event grouping (EVENT_GROUPS), straight from the sparse matrix. The
+    result is at most max_bins x max_bins for the id groupings and one row /
+    column per category otherwise, whatever the number of students and events.
+    """
+    matrix, student_ids, event_ids = aggregates.matrix()
+    rows = _group_labels(student_ids, students, 'student_id', STUDENT_GROUPS[student_group], max_bins)
+    cols = _group_labels(event_ids, events, 'event_id', EVENT_GROUPS[event_group], max_bins)
+    table = bin_matrix(matrix, rows, cols)
+    if STUDENT_GROUPS[student_group] is not None:
+        table = table.sort_index()
+    if EVENT_GROUPS[event_group] is not None:
+        table = table.sort_index(axis=1)
+    table.index.name, table.columns.name = student_group, event_group
+    return table
+
+
+def summarize_events(recs, volunteers):
+    """Overview numbers for the (small) recommendations table."""
+    return {
+        "events": len(recs),
+        "sports_events": int((recs['event_type'] == 'Sports').sum()),
+        "volunteers": len(volunteers),
+        "injuries": int(recs['injuries'].sum()),
+        "avg_attendance": float(recs['current_participants'].mean()) if len(recs) else 0.0,
+        "type_counts": recs['event_type'].astype(str).value_counts(),
+        "attendance": recs[['event_name', 'current_participants']].sort_values('current_participants', ascending=False),
+    }
+
+
+_aggregates = {}
+_aggregates_lock = threading.Lock()
+
+
+def get_aggregates(path=LOGS_CSV):
+    """Process-wide aggregates per log file, already caught up with the file on disk."""
+    with _aggregates_lock:
+        if path not in _aggregates:
+            _aggregates[path] = ParticipationAggregates(path)
+        aggregates = _aggregates[path]
+    aggregates.poll()
+    return aggregates
@@ -0,0 +1,112 @@
+import matplotlib
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+# Chart builders shared by the analysis scripts and the Admin dashboard.
+# Each one returns a Figure: the scripts show it interactively, the dashboard
+# (and the scripts' --save mode) render it through utils.figure_cache once per
+# (data fingerprint, parameters) and reuse the PNG bytes afterwards.
+
+EVENT_PANELS = {
+    # panel -> (recs column, color, title, y label)
+    "score": ('score', "steelblue", "Hybrid Score per Event", "Hybrid Score"),
+    "injuries": ('injuries', "tomato", "Number of Injuries per Event", "Injuries"),
+    "volunteers": ('volunteer_count', "mediumseagreen", "Volunteers Assigned per Event", "Number of Volunteers"),
+}
+
+
+def _style(style):
+    # Seaborn theme for one figure only (None = plain matplotlib defaults)
+    return sns.axes_style(style) if style else matplotlib.rc_context()
+
+
+def _event_bar(ax, recs, panel, fontsize, title=None, xlabel=""):
+    col, color, default_title, ylabel = EVENT_PANELS[panel]
+    sns.barplot(data=recs.sort_values(col, ascending=False), x='event_name', y=col, color=color, ax=ax)
+    ax.set_title(title or default_title, fontsize=fontsize)
+    ax.set_xlabel(xlabel, fontsize=12)
+    ax.set_ylabel(ylabel, fontsize=12)
+
+
+def _turnout_scatter(ax, recs, fontsize, title="Predicted vs Actual Participants"):
+    sns.scatterplot(data=recs, x='predicted_turnout', y='actual_count', hue='event_type', s=100, palette="Set2", ax=ax)
+    max_val = max(recs['predicted_turnout'].max(), recs['actual_count'].max())
+    ax.plot([0, max_val], [0, max_val], 'r--', label="Perfect Prediction")
+    ax.set_title(title, fontsize=fontsize)
+    ax.set_xlabel("Predicted Turnout", fontsize=12)
+    ax.set_ylabel("Actual Participants", fontsize=12)
+    ax.legend(title="Event Type")
+
+
+# ---------- Analysis scripts ----------
+def event_bar(recs, panel, title=None, style=None):
+    """One EVENT_PANELS bar chart, events sorted by that column."""
+    with _style(style):
+        fig, ax = plt.subplots(figsize=(12, 6))
+        _event_bar(ax, recs, panel, 14, title, xlabel="Event Name")
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        fig.tight_layout()
+    return fig
+
+
+def turnout_scatter(recs, style=None):
+    with _style(style):
+        fig, ax = plt.subplots(figsize=(10, 6))
+        _turnout_scatter(ax, recs, 14, title="Predicted Turnout vs Actual Participants")
+        fig.tight_layout()
+    return fig
+
+
+def event_type_counts(recs, style=None):
+    with _style(style):
+        fig, ax = plt.subplots(figsize=(8, 5))
+        sns.countplot(data=recs, x='event_type', color="mediumseagreen", ax=ax)
+        ax.set_title("Distribution of Recommended Event Types", fontsize=14)
+        ax.set_xlabel("Event Type", fontsize=12)
+        ax.set_ylabel("Number of Events", fontsize=12)
+        fig.tight_layout()
+    return fig
+
+
+def event_dashboard(recs, panels=("score", "turnout", "injuries", "volunteers"), fontsize=16, width=14, xlabel="",
+                    style=None):
+    """Stacked panels: EVENT_PANELS names plus "turnout" for the prediction scatter."""
+    with _style(style):
+        fig, axes = plt.subplots(len(panels), 1, figsize=(width, 5.5 * len(panels)))
+        for ax, panel in zip(axes, panels):
+            if panel == "turnout":
+                _turnout_scatter(ax, recs, fontsize)
+            else:
+                _event_bar(ax, recs, panel, fontsize, xlabel=xlabel)
+                ax.tick_params(axis='x', rotation=45)
+        fig.tight_layout()
+    return fig
+
+
+# ---------- Admin dashboard ----------
+def attendance_bar(attendance):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(data=attendance, x='event_name', y='current_participants', palette="Blues_d", ax=ax)
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha='right')
+    ax.set_ylabel("Current Participants")
+    ax.set_xlabel("Event Name")
+    fig.tight_layout()
+    return fig
+
+
+def type_bar(type_counts):
+    fig, ax = plt.subplots(figsize=(6, 4))
+    sns.barplot(x=type_counts.index, y=type_counts.values, palette="Set2", ax=ax)
+    ax.set_ylabel("Number of Events")
+    ax.set_xlabel("Event Type")
+    fig.tight_layout()
+    return fig
+
+
+def participation_heatmap(table, xlabel, ylabel):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.heatmap(table, cmap="YlGnBu", cbar_kws={'label': 'Participation Count'}, ax=ax)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    fig.tight_layout()
+    return fig
@@ -1,128 +1,52 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import ast
+import argparse
 import os
+import sys
+
+import matplotlib.pyplot as plt
+
+# Run from the project root; make `utils` importable when started as a script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils import data_store
+from utils.figure_cache import FIGURE_CACHE_DIR, FigureCache
+from analysis import charts
+
+parser = argparse.ArgumentParser(description="Recommendation analysis plots")
+parser.add_argument("--save", metavar="DIR", help="write the plots as PNGs here instead of opening windows")
+args = parser.parse_args()
 
 # ---------- Setup ----------
 print("Current working directory:", os.getcwd())
-sns.set(style="whitegrid")  # consistent style for all plots
-
-# ---------- Load Data ----------
-recs = pd.read_csv("outputs/hybrid_sports_recommendations.csv")
+STYLE = "whitegrid"  # consistent style for all plots
+figures = FigureCache(cache_dir=FIGURE_CACHE_DIR)
 
-# Parse participants lists stored as string
-recs['actual_participants'] = recs['actual_participants'].apply(
-    lambda x: ast.literal_eval(x) if pd.notna(x) else []
-)
+def show(name, draw, *data, **params):
+    """Interactive window, or with --save a PNG rendered through the disk cache."""
+    if args.save:
+        print("Saved", figures.save(os.path.join(args.save, f"{name}.png"), draw, *data, **params))
+    else:
+        draw(*data, **params)
+        plt.show()
 
-# Compute actual participant count
-recs['actual_count'] = recs['actual_participants'].apply(len)
+# ---------- Load Data ----------
+# Participant / volunteer counts are groupby counts over the long tables
+recs, _, _ = data_store.load_recommendations()
+recs['actual_count'] = recs['current_participants']
 
 # ---------- 1️⃣ Top events by hybrid score ----------
-plt.figure(figsize=(12,6))
-sns.barplot(
-    data=recs.sort_values('score', ascending=False),
-    x='event_name',
-    y='score',
-    color="steelblue"
-)
-plt.xticks(rotation=45, ha='right')
-plt.title("Top Recommended Events by Hybrid Score", fontsize=14)
-plt.xlabel("Event Name", fontsize=12)
-plt.ylabel("Hybrid Score", fontsize=12)
-plt.tight_layout()
-plt.show()
+show("hybrid_score", charts.event_bar, recs, panel="score", title="Top Recommended Events by Hybrid Score",
+     style=STYLE)
 
 # ---------- 2️⃣ Predicted turnout vs actual participants ----------
-plt.figure(figsize=(10,6))
-sns.scatterplot(
-    data=recs,
-    x='predicted_turnout',
-    y='actual_count',
-    hue='event_type',
-    s=100,
-    palette="Set2"
-)
-max_val = max(recs['predicted_turnout'].max(), recs['actual_count'].max())
-plt.plot([0, max_val], [0, max_val], 'r--', label="Perfect Prediction")
-plt.title("Predicted Turnout vs Actual Participants", fontsize=14)
-plt.xlabel("Predicted Turnout", fontsize=12)
-plt.ylabel("Actual Participants", fontsize=12)
-plt.legend(title="Event Type")
-plt.tight_layout()
-plt.show()
+show("predicted_vs_actual", charts.turnout_scatter, recs, style=STYLE)
 
 # ---------- 3️⃣ Event type distribution ----------
-plt.figure(figsize=(8,5))
-sns.countplot(data=recs, x='event_type', color="mediumseagreen")
-plt.title("Distribution of Recommended Event Types", fontsize=14)
-plt.xlabel("Event Type", fontsize=12)
-plt.ylabel("Number of Events", fontsize=12)
-plt.tight_layout()
-plt.show()
+show("event_types", charts.event_type_counts, recs, style=STYLE)
 
 # ---------- 4️⃣ Injuries per event ----------
-plt.figure(figsize=(12,6))
-sns.barplot(
-    data=recs.sort_values('injuries', ascending=False),
-    x='event_name',
-    y='injuries',
-    color="tomato"
-)
-plt.xticks(rotation=45, ha='right')
-plt.title("Number of Injuries per Event", fontsize=14)
-plt.xlabel("Event Name", fontsize=12)
-plt.ylabel("Injuries", fontsize=12)
-plt.tight_layout()
-plt.show()
+show("injuries", charts.event_bar, recs, panel="injuries", style=STYLE)
 
 
 # ---------- 5️⃣ Combined Event Dashboard ----------
-fig, axes = plt.subplots(3, 1, figsize=(12, 18))
-
-# ---- a) Hybrid Score ----
-sns.barplot(
-    data=recs.sort_values('score', ascending=False),
-    x='event_name',
-    y='score',
-    color="steelblue",
-    ax=axes[0]
-)
-axes[0].set_title("Hybrid Score per Event", fontsize=14)
-axes[0].set_xlabel("Event Name", fontsize=12)
-axes[0].set_ylabel("Hybrid Score", fontsize=12)
-axes[0].tick_params(axis='x', rotation=45)
-
-# ---- b) Predicted vs Actual Turnout ----
-max_val = max(recs['predicted_turnout'].max(), recs['actual_count'].max())
-sns.scatterplot(
-    data=recs,
-    x='predicted_turnout',
-    y='actual_count',
-    hue='event_type',
-    s=100,
-    palette="Set2",
-    ax=axes[1]
-)
-axes[1].plot([0, max_val], [0, max_val], 'r--', label="Perfect Prediction")
-axes[1].set_title("Predicted vs Actual Participants", fontsize=14)
-axes[1].set_xlabel("Predicted Turnout", fontsize=12)
-axes[1].set_ylabel("Actual Participants", fontsize=12)
-axes[1].legend(title="Event Type")
-
-# ---- c) Injuries ----
-sns.barplot(
-    data=recs.sort_values('injuries', ascending=False),
-    x='event_name',
-    y='injuries',
-    color="tomato",
-    ax=axes[2]
-)
-axes[2].set_title("Number of Injuries per Event", fontsize=14)
-axes[2].set_xlabel("Event Name", fontsize=12)
-axes[2].set_ylabel("Injuries", fontsize=12)
-axes[2].tick_params(axis='x', rotation=45)
-
-plt.tight_layout()
-plt.show()
+# a) Hybrid Score, b) Predicted vs Actual Turnout, c) Injuries
+show("combined_dashboard", charts.event_dashboard, recs, panels=("score", "turnout", "injuries"), fontsize=14,
+     width=12, xlabel="Event Name", style=STYLE)
@@ -1,12 +1,13 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import ast
-import json
-import os
-from datetime import datetime
-from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
+from models.sports.alert_store import get_store
+from models.sports.alert_bus import AlertFeed
+from utils.attendance_feed import get_feed
+from app import data_cache
+from app.paged_grid import paged_grid
+from analysis.aggregates import EVENT_GROUPS, STUDENT_GROUPS, get_aggregates
+from analysis import charts
+from utils.figure_cache import get_cache as get_figure_cache
 
 # ---------- Page Config ----------
 st.set_page_config(
@@ -19,20 +20,19 @@ st.title("🏫 IU Smart Campus Admin Dashboard")
 st.markdown("### Minimal Analytics for Students, Events, and Sports")
 
 # ---------- Load Data ----------
-students = pd.read_csv("data/students.csv")
-logs = pd.read_csv("data/participation_logs.csv")
-events = pd.read_csv("outputs/hybrid_sports_recommendations.csv")
-attendance = pd.read_csv("data/attendance.csv")
+# Cached per file version: a widget click reuses the parsed frames
+students = data_cache.load("students")
+# Participants / volunteers come as long (event_id, student_id) tables
+events, event_participants, event_volunteers, volunteers_by_event = data_cache.recommendations()
+# Live check-ins: each rerun only parses the rows appended since the last one
+attendance_feed = get_feed("data/attendance.csv")
 
-# Convert string lists to actual lists
-events['actual_participants'] = events['actual_participants'].apply(lambda x: ast.literal_eval(x) if pd.notna(x) else [])
-events['assigned_volunteers'] = events['assigned_volunteers'].apply(lambda x: ast.literal_eval(x) if pd.notna(x) else [])
-events['current_participants'] = events['actual_participants'].apply(len)
-events['remaining_seats'] = 50 - events['current_participants']  # assuming 50 capacity per event
-events['score'] = events['score'].round(2)
 
 # ---------- Sidebar ----------
 st.sidebar.header("Navigation")
+if st.sidebar.button("🔄 Reload Data"):
+    data_cache.clear()
+    st.rerun()
 module = st.sidebar.radio(
     "Select Module",
     ["Overview", "Students", "Events", "Sports"]
@@ -42,33 +42,27 @@ module = st.sidebar.radio(
 if module == "Overview":
     # --- NEW: LIVE EMERGENCY ALERTS SECTION ---
     st.subheader("🚨 Live Field Alerts")
-    alert_path = "outputs/live_injury.json"
-
-    if os.path.exists(alert_path):
-        try:
-            with open(alert_path, "r") as f:
-                live_alerts = json.load(f)
-            
-            if live_alerts:
-                # Display the most recent alert in a big red box
-                latest = live_alerts[-1]
-                st.error(f"**URGENT:** {latest['event']} detected at {latest['timestamp']}!")
-                
-                # Show all active alerts in an expander
-                with st.expander("View Alert History / Manage Alerts"):
-                    for i, alert in enumerate(reversed(live_alerts)):
-                        col_a, col_b = st.columns([4, 1])
-                        col_a.write(f"⚠️ **{alert['event']}** - Received at: {alert['timestamp']}")
-                        if col_b.button("Done", key=f"clear_{i}"):
-                            # Remove the specific alert and update file
-                            live_alerts.remove(alert)
-                            with open(alert_path, "w") as f:
-                                json.dump(live_alerts, f)
-                            st.rerun()
-            else:
-                st.success("✅ All clear. No active injuries on field.")
-        except Exception as e:
-            st.info("System initializing or alert file being updated...")
+    alert_store = get_store()
+    # Cached per session, re-queried only when the alert log actually changed
+    if "alert_feed" not in st.session_state:
+        st.session_state["alert_feed"] = AlertFeed(alert_store)
+    live_alerts = st.session_state["alert_feed"].active()
+
+    if live_alerts:
+        # Display the most recent alert in a big red box
+        latest = live_alerts[-1]
+        st.error(f"**URGENT:** {latest['event']} detected at {latest['timestamp']}!")
+        
+        # Show all active alerts in an expander
+        with st.expander("View Alert History / Manage Alerts"):
+            for alert in reversed(live_alerts):
+                col_a, col_b = st.columns([4, 1])
+                where = f" ({alert['source'] or 'live'}, player #{alert['track_id']})" if alert.get('track_id') else ""
+                col_a.write(f"⚠️ **{alert['event']}** - Received at: {alert['timestamp']}{where}")
+                if col_b.button("Done", key=f"clear_{alert['id']}"):
+                    # Acknowledge the alert; history itself is never rewritten
+                    alert_store.acknowledge(alert['id'])
+                    st.rerun()
     else:
         st.success("✅ Field Monitoring: No active incidents.")
 
@@ -78,98 +72,67 @@ if module == "Overview":
     # ---------- Metrics ----------
     # (Keep your metrics calculations same as before)
     # Update total_injuries to include both CSV data and Live alerts
-    live_count = 0
-    if os.path.exists(alert_path):
-        with open(alert_path, "r") as f:
-            live_count = len(json.load(f))
+    # Everything below renders from small precomputed tables
+    overview = data_cache.overview()
+    live_count = len(live_alerts)
     
-    total_injuries = events['injuries'].sum() + live_count
+    total_injuries = overview['injuries'] + live_count
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Total Students", len(students))
-    col2.metric("Total Upcoming Events", len(events))
-    col3.metric("Total Sports Events", len(events[events['event_type'] == 'Sports']))
+    col2.metric("Total Upcoming Events", overview['events'])
+    col3.metric("Total Sports Events", overview['sports_events'])
 
     col4, col5, col6 = st.columns(3)
-    col4.metric("Total Volunteers Assigned", events['assigned_volunteers'].apply(len).sum())
+    col4.metric("Total Volunteers Assigned", overview['volunteers'])
     col5.metric("Total Injuries (All Time)", int(total_injuries), delta=f"+{live_count} Live" if live_count > 0 else None)
-    col6.metric("Avg. Attendance per Event", f"{events['current_participants'].mean():.1f}")
+    col6.metric("Avg. Attendance per Event", f"{overview['avg_attendance']:.1f}")
 
     st.markdown("---")
 
     # ---------- Event Attendance Overview ----------
     st.markdown("### Event Attendance Overview")
-    fig, ax = plt.subplots(figsize=(10,5))
-    sns.barplot(
-        data=events.sort_values('current_participants', ascending=False),
-        x='event_name',
-        y='current_participants',
-        palette="Blues_d",
-        ax=ax
-    )
-    ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha='right')
-    ax.set_ylabel("Current Participants")
-    ax.set_xlabel("Event Name")
-    plt.tight_layout()
-    st.pyplot(fig)
+    # Charts are cached as PNG bytes per data fingerprint: an unchanged chart is a dict lookup
+    figures = get_figure_cache()
+    st.image(figures.render(charts.attendance_bar, overview['attendance']), width="stretch")
 
     # ---------- Event Type Distribution ----------
     st.markdown("### Event Type Distribution")
-    fig2, ax2 = plt.subplots(figsize=(6,4))
-    sns.countplot(data=events, x='event_type', palette="Set2", ax=ax2)
-    ax2.set_ylabel("Number of Events")
-    ax2.set_xlabel("Event Type")
-    plt.tight_layout()
-    st.pyplot(fig2)
+    st.image(figures.render(charts.type_bar, overview['type_counts']), width="stretch")
 
     # ---------- Participation Heatmap ----------
     st.markdown("### Student Participation Heatmap")
-    if 'student_id' in logs.columns and 'event_id' in logs.columns:
-        participation_matrix = logs.pivot_table(index='student_id', columns='event_id', aggfunc='size', fill_value=0)
-        fig3, ax3 = plt.subplots(figsize=(12,6))
-        sns.heatmap(participation_matrix, cmap="YlGnBu", cbar_kws={'label': 'Participation Count'}, ax=ax3)
-        ax3.set_xlabel("Event ID")
-        ax3.set_ylabel("Student ID")
-        plt.tight_layout()
-        st.pyplot(fig3)
+    # Maintained incrementally from participation_logs.csv (only new rows are parsed)
+    aggregates = get_aggregates("data/participation_logs.csv")
+    if aggregates.totals()['rows']:
+        # Binned server-side from the sparse matrix: at most ~60 x 60 cells reach matplotlib
+        col_a, col_b = st.columns(2)
+        student_group = col_a.selectbox("Group students by", list(STUDENT_GROUPS))
+        event_group = col_b.selectbox("Group events by", list(EVENT_GROUPS))
+        participation_matrix = data_cache.heatmap(aggregates, student_group, event_group)
+        st.image(figures.render(charts.participation_heatmap, participation_matrix,
+                                xlabel=event_group, ylabel=student_group), width="stretch")
     else:
         st.info("No participation logs available to generate heatmap")
 
 # ---------- STUDENTS ----------
 elif module == "Students":
     st.header("👨‍🎓 Students & Participation Records")
+    logs = data_cache.load("participation_logs")
 
     st.subheader("📋 All Students")
-    students_sorted = students.sort_values("name")
-
-    # Configure AgGrid
-    gb = GridOptionsBuilder.from_dataframe(students_sorted)
-    gb.configure_selection(selection_mode="single", use_checkbox=False)
-    gb.configure_pagination(enabled=True)
-    gb.configure_grid_options(domLayout='normal')
-    grid_options = gb.build()
-
-    grid_response = AgGrid(
-        students_sorted,
-        gridOptions=grid_options,
-        height=300,
-        width='100%',
-        update_mode=GridUpdateMode.SELECTION_CHANGED,
-        fit_columns_on_grid_load=True
-    )
+    # Only the visible page is queried from the indexed grid store and sent to the browser
+    student = paged_grid(data_cache.students_grid(), "students", 'student_id', 'name',
+                         filter_columns=['major', 'year'], sort="name")
 
-    selected = grid_response.get('selected_rows')  # this is a list of dicts
-
-    if selected is None or (isinstance(selected, (list, pd.DataFrame)) and len(selected) == 0):
+    if student is None:
         st.warning("🔹 Click a row to view student details")
     else:
-        # Convert the first selected dict to a DataFrame row
-        student = pd.DataFrame(selected).iloc[0]
         student_id = student['student_id']
 
         # Show student details
         st.subheader("📄 Student Details")
-        st.json(student.to_dict())
+        st.json(student)
 
         # Participation history
         st.subheader("📅 Participation History")
@@ -187,43 +150,22 @@ elif module == "Students":
 # ---------- EVENTS ----------
 elif module == "Events":
     st.header("🎯 Events Management")
+    logs = data_cache.load("participation_logs")
     
-    # 1️⃣ Sort events by score
-    events_sorted = events.sort_values('score', ascending=False)
-
-    # 2️⃣ Configure AgGrid for Event Selection
-    gb = GridOptionsBuilder.from_dataframe(events_sorted[['event_id', 'event_name', 'event_type', 'score', 'current_participants', 'remaining_seats']])
-    gb.configure_selection(selection_mode="single", use_checkbox=False)
-    gb.configure_pagination(enabled=True)
-    grid_options = gb.build()
-
+    # 1️⃣ Events by score, paged / filtered / sorted server-side
     st.subheader("📋 Select an Event")
-    grid_response = AgGrid(
-        events_sorted,
-        gridOptions=grid_options,
-        height=300,
-        update_mode=GridUpdateMode.SELECTION_CHANGED,
-        fit_columns_on_grid_load=True,
-        theme='streamlit'
-    )
+    event_row = paged_grid(data_cache.events_grid(), "events", 'event_id', 'event_name',
+                           filter_columns=['event_type'], sort="score", descending=True)
 
-    selected_event = grid_response.get('selected_rows')
-
-    # 3️⃣ Robust Selection Check
-    if selected_event is None or (isinstance(selected_event, (list, pd.DataFrame)) and len(selected_event) == 0):
+    # 2️⃣ Selection resolved by event_id lookup
+    if event_row is None:
         st.info("💡 Select an event from the table above to view volunteers and participants.")
     else:
-        # Normalize selected data to a Series
-        if isinstance(selected_event, pd.DataFrame):
-            event_row = selected_event.iloc[0]
-        else:
-            event_row = pd.DataFrame(selected_event).iloc[0]
-        
         selected_event_id = event_row['event_id']
         st.divider()
         st.subheader(f"🔍 Details for: {event_row['event_name']}")
 
-        # 4️⃣ Display Volunteers & Participants in Two Columns
+        # 3️⃣ Display Volunteers & Participants in Two Columns
         col1, col2 = st.columns(2)
 
         with col1:
@@ -243,21 +185,21 @@ elif module == "Events":
         with col2:
             st.markdown("### 👥 Participants")
             # Filter attendance for students who joined this event
-            event_participants = attendance[attendance['event_id'] == selected_event_id]
+            live_participants = pd.DataFrame({'student_id': sorted(attendance_feed.participants(selected_event_id))})
             
-            if event_participants.empty:
+            if live_participants.empty:
                 st.write("No participants registered yet.")
             else:
                 # Merge with students to get names
-                part_details = event_participants.merge(students[['student_id', 'name']], on='student_id')
+                part_details = live_participants.merge(students[['student_id', 'name']], on='student_id')
                 st.dataframe(part_details[['name', 'student_id']], use_container_width=True)
 
 # ---------- SPORTS ----------
 elif module == "Sports":
     st.subheader("⛹️ Sports Event Management")
     
-    # Load the hybrid output
-    df_recs = pd.read_csv("outputs/hybrid_sports_recommendations.csv")
+    # Hybrid output and volunteer ids per event (both from the cached data layer)
+    df_recs = events
     
     # Show the AI-powered assignments
     for index, row in df_recs.iterrows():
@@ -266,4 +208,4 @@ elif module == "Sports":
             col1.write(f"**Predicted Turnout:** {row['predicted_turnout']}")
             col1.write(f"**Live Injuries:** {row['injuries']}")
             col2.write(f"**AI-Assigned Volunteers:**")
-            col2.write(row['assigned_volunteers'])
+            col2.write(volunteers_by_event.get(row['event_id'], []))
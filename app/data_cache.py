@@ -0,0 +1,119 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from analysis.aggregates import heatmap_table, summarize_events
+from utils import data_store, grid_store
+
+# Upper bound on how long a cached frame lives even if its file never changes
+CACHE_TTL = 600
+SEATS_PER_EVENT = 50
+
+
+def file_version(path):
+    """(mtime_ns, size) of a file; the cache key that changes whenever the file does."""
+    try:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    except FileNotFoundError:
+        return None
+
+
+def dataset_version(name):
+    return file_version(data_store.SCHEMAS[name][0])
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _load(name, version):
+    # `version` is only part of the cache key
+    return data_store.load(name)
+
+
+def load(name):
+    """A data_store dataset, re-read only when its CSV changed (or the TTL ran out)."""
+    return _load(name, dataset_version(name))
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _recommendations(version, day):
+    recs, participants, volunteers = data_store.load_recommendations()
+
+    # Derived columns, computed once per data version instead of on every click
+    recs['remaining_seats'] = SEATS_PER_EVENT - recs['current_participants']
+    recs['score'] = recs['score'].round(2)
+    if 'event_date' not in recs.columns:
+        # Dummy upcoming dates, one every 3 days from today
+        recs['event_date'] = pd.date_range(start=day, periods=len(recs), freq="3D")
+    volunteers_by_event = volunteers.groupby('event_id')['student_id'].agg(list)
+    return recs, participants, volunteers, volunteers_by_event
+
+
+def recommendations():
+    """
+    Hybrid recommendations with current_participants, remaining_seats and
+    event_date filled in, plus the participant / volunteer long tables and the
+    volunteer ids grouped per event.
+    """
+    return _recommendations(dataset_version("recommendations"), datetime.today().date())
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _overview(version, day):
+    recs, _, volunteers, _ = _recommendations(version, day)
+    return summarize_events(recs, volunteers)
+
+
+def overview():
+    """Overview metrics / chart tables, computed once per recommendations version."""
+    return _overview(dataset_version("recommendations"), datetime.today().date())
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False, max_entries=32)
+def _heatmap(_aggregates, version, students_version, events_version, student_group, event_group, max_bins):
+    # Leading underscore: the aggregates object itself isn't hashed, its version is
+    return heatmap_table(_aggregates, load("students"), load("events"), student_group, event_group, max_bins)
+
+
+def heatmap(aggregates, student_group, event_group, max_bins=60):
+    """Binned participation table, recomputed only when the logs or the grouping change."""
+    return _heatmap(aggregates, aggregates.version, dataset_version("students"), dataset_version("events"),
+                    student_group, event_group, max_bins)
+
+
+EVENT_GRID_COLUMNS = ['event_id', 'event_name', 'event_type', 'score', 'current_participants', 'remaining_seats']
+
+
+def students_grid():
+    """Grid store with the students table, re-synced only when students.csv changed."""
+    store = grid_store.get_store()
+    store.sync("students", load("students"), "student_id", dataset_version("students"),
+               indexes=['name', 'year', 'major', 'GPA', 'interests'], text_columns=['name'])
+    return store
+
+
+def events_grid():
+    """Grid store with the events grid columns, re-synced only when the recommendations changed."""
+    store = grid_store.get_store()
+    version = dataset_version("recommendations")
+    store.sync("events", recommendations()[0][EVENT_GRID_COLUMNS], "event_id", version,
+               indexes=['event_name', 'event_type', 'score', 'current_participants', 'remaining_seats'],
+               text_columns=['event_name'])
+    return store
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _video_files(video_dir, version):
+    return sorted(v for v in os.listdir(video_dir) if v.endswith(".mp4"))
+
+
+def video_files(video_dir="data/sports_videos"):
+    """mp4 files in the video folder; re-listed only when the folder changes."""
+    return _video_files(video_dir, file_version(video_dir))
+
+
+def clear():
+    """Explicit invalidation (e.g. a "Reload data" button) of this module's caches only."""
+    for cached in (_load, _recommendations, _overview, _heatmap, _video_files):
+        cached.clear()
@@ -0,0 +1,77 @@
+import math
+
+import streamlit as st
+from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
+
+PAGE_SIZES = [25, 50, 100]
+
+
+def paged_grid(store, name, key, search_column, filter_columns=(), sort="name", descending=False, grid_key=None,
+               height=300, theme='streamlit'):
+    """
+    AgGrid over one page of a GridStore table. Search, filters, sort and the
+    page number are Streamlit widgets whose values are pushed down into a
+    single indexed query, so only the visible rows are ever sent to the
+    browser. Returns the full stored row (dict) of the selected record,
+    looked up by its key, or None.
+    """
+    grid_key = grid_key or f"{name}_grid"
+    columns = store.columns(name)
+
+    # 1. Search / filter / sort controls
+    cols = st.columns(len(filter_columns) + 3)
+    search = cols[0].text_input(f"Search {search_column.replace('_', ' ')}", key=f"{grid_key}_search").strip()
+    filters = {}
+    for col, widget in zip(filter_columns, cols[1:]):
+        value = widget.selectbox(col.replace('_', ' ').title(), ["All"] + store.distinct(name, col),
+                                 key=f"{grid_key}_{col}")
+        if value != "All":
+            filters[col] = value
+    sort = cols[-2].selectbox("Sort by", columns, index=columns.index(sort), key=f"{grid_key}_sort")
+    descending = cols[-1].selectbox("Order", ["Ascending", "Descending"], index=int(descending),
+                                    key=f"{grid_key}_order") == "Descending"
+
+    # 2. Back to page 1 whenever the query itself changes
+    page_key = f"{grid_key}_page"
+    query = (search, tuple(sorted(filters.items())), sort, descending, st.session_state.get(f"{grid_key}_size"))
+    if st.session_state.get(f"{grid_key}_query") != query:
+        st.session_state[f"{grid_key}_query"] = query
+        st.session_state[page_key] = 1
+
+    # 3. Fetch only the requested page (the total comes from the same WHERE clause)
+    page_size = st.session_state.get(f"{grid_key}_size", PAGE_SIZES[0])
+    page = st.session_state.get(page_key, 1)
+    rows, total = store.page(name, page, page_size, sort, descending, filters, search, search_column)
+    pages = max(math.ceil(total / page_size), 1)
+    if page > pages:
+        st.session_state[page_key] = page = pages
+        rows, total = store.page(name, page, page_size, sort, descending, filters, search, search_column)
+
+    # Sorting / filtering happens in the query above, not inside the page
+    gb = GridOptionsBuilder.from_dataframe(rows)
+    gb.configure_default_column(sortable=False, filter=False)
+    gb.configure_selection(selection_mode="single", use_checkbox=False)
+    gb.configure_grid_options(domLayout='normal')
+    grid_response = AgGrid(
+        rows,
+        gridOptions=gb.build(),
+        height=height,
+        width='100%',
+        update_mode=GridUpdateMode.SELECTION_CHANGED,
+        fit_columns_on_grid_load=True,
+        theme=theme,
+        key=f"{grid_key}_{page}_{hash(query)}"
+    )
+
+    # 4. Pager
+    col_a, col_b, col_c = st.columns([1, 1, 2])
+    col_a.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=page_key)
+    col_b.selectbox("Rows per page", PAGE_SIZES, key=f"{grid_key}_size")
+    col_c.caption(f"{total} matching rows")
+
+    # 5. Selection -> key -> full record
+    selected = grid_response.get('selected_rows')
+    if selected is None or len(selected) == 0:
+        return None
+    first = selected.iloc[0] if hasattr(selected, "iloc") else selected[0]
+    return store.lookup(name, first[key])
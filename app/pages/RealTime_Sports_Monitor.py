@@ -4,33 +4,56 @@ import os
 import json
 import ast
 import time
-from models.sports.injury_detection import detect_injury_live
+from models.sports.video_pipeline import VideoPipeline
+from models.sports.model_registry import DEFAULT_WEIGHTS, get_model, model_stats
+from models.sports.alert_store import get_store
+from models.sports.alert_bus import AlertFeed
+from app import data_cache
 
 st.title("🏃 Real-Time Sports Injury Monitoring")
 
 VIDEO_DIR = "data/sports_videos"
-videos = [v for v in os.listdir(VIDEO_DIR) if v.endswith(".mp4")]
+videos = data_cache.video_files(VIDEO_DIR)
 selected_video = st.selectbox("Select Sports Video", videos)
 video_path = os.path.join(VIDEO_DIR, selected_video)
 
+# Model is loaded (and warmed up) once per process, not on every rerun.
+# The weights only apply to this session's stream, other sessions keep theirs.
+weights = st.sidebar.text_input("YOLO Weights", DEFAULT_WEIGHTS)
+with st.spinner("Loading detection model..."):
+    get_model(weights, warmup=True)
+st.sidebar.caption(f"Model timings: {model_stats()}")
+
+# Frames sent to YOLO per inference call (1 = classic per-frame mode)
+batch_size = st.sidebar.number_input("Inference Batch Size", min_value=1, max_value=32, value=1)
+
+# What to do with frames when inference can't keep up with decoding
+drop_policy = st.sidebar.selectbox("Frame Drop Policy", ["latest", "every_k"])
+every_k = st.sidebar.number_input("Under load, process every k-th frame", min_value=1, max_value=10, value=2, disabled=drop_policy != "every_k")
+
+# Skip YOLO on frames that barely changed (reuses the previous boxes)
+motion_gating = st.sidebar.checkbox("Motion-Gated Inference", value=True)
+
 # --- Define the UI Section for Alerts BEFORE the Video ---
 st.markdown("---")
 st.subheader("📡 Live Injury Alerts")
 alert_placeholder = st.empty()  # This is the "Live" box
 
+alert_store = get_store()
+
+# One feed per browser session: redraw the alert box only when alerts change
+if "alert_feed" not in st.session_state:
+    st.session_state["alert_feed"] = AlertFeed(alert_store)
+alert_feed = st.session_state["alert_feed"]
+
 def show_alert_box():
-    alert_path = "outputs/live_injury.json"
-    if os.path.exists(alert_path):
-        try:
-            with open(alert_path, "r") as f:
-                alerts = json.load(f)
-            
-            with alert_placeholder.container():
-                # Show newest alert at the top
-                for alert in reversed(alerts):
-                    st.warning(f"**Status:** 🚨 {alert.get('event')} | **Time:** {alert.get('timestamp')}")
-        except:
-            pass
+    alerts = alert_feed.active()
+    if alerts:
+        with alert_placeholder.container():
+            # Show newest alert at the top
+            for alert in reversed(alerts):
+                player = f" | **Player:** #{alert['track_id']}" if alert.get('track_id') else ""
+                st.warning(f"**Status:** 🚨 {alert.get('event')} | **Time:** {alert.get('timestamp')}{player}")
     else:
         alert_placeholder.success("✅ Monitoring: Field Clear")
 
@@ -38,42 +61,39 @@ def show_alert_box():
 show_alert_box()
 
 # --- THE CLEAR BUTTON SECTION (Always runs after/outside the loop) ---
-alert_path = "outputs/live_injury.json"
-if os.path.exists(alert_path):
+if alert_feed.active():
     # We place the button outside the loop so it's clickable after monitoring
     if st.button("🗑️ Clear All Alerts"):
-        try:
-            os.remove(alert_path)
-            st.success("All alerts cleared!")
-            time.sleep(0.5)
-            st.rerun()
-        except PermissionError:
-            st.error("Error: System busy. Try again in a second.")
+        # Acknowledge instead of deleting: the alert history stays intact
+        alert_store.acknowledge_all()
+        st.success("All alerts cleared!")
+        time.sleep(0.5)
+        st.rerun()
 
 
 # --- Video Monitoring Section ---
 if st.button("▶ Start Live Monitoring"):
-    cap = cv2.VideoCapture(video_path)
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    if fps == 0: fps = 30
+    pipeline = VideoPipeline(video_path, batch_size=batch_size, drop_policy=drop_policy, every_k=every_k, motion_gating=motion_gating,
+                             weights=weights).start()
     
     st_frame = st.empty() 
-    fall_counter = 0
+    st_stats = st.sidebar.empty()
     
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret: break
-
-        processed_frame, fall_counter, is_injured = detect_injury_live(frame, fall_counter, fps)
-        
-        # 1. Update the Video Frame
-        frame_rgb = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
-        st_frame.image(frame_rgb, channels="RGB", use_container_width=True)
-
-        # 2. Update the Status Box LIVE while video plays
-        show_alert_box()
-
-    cap.release()
+    try:
+        for frame_rgb, detections, fall_counter, is_injured in pipeline:
+            # 1. Update the Video Frame
+            st_frame.image(frame_rgb, channels="RGB", use_container_width=True)
+
+            # 2. Update the Status Box only when an alert was raised or cleared
+            if alert_feed.changed():
+                show_alert_box()
+
+            # 3. Backpressure counters (where the time goes)
+            st_stats.json(pipeline.stats())
+    except Exception as e:
+        st.error(f"Monitoring stopped: detection failed ({e})")
+    finally:
+        pipeline.stop()
 
 
 
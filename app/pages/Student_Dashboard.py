@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import ast
+import os
+from models.recommender.recommendation_store import DEFAULT_DB, get_recommendations
+from app import data_cache
 
 st.set_page_config(page_title="Student Dashboard", layout="wide")
 
@@ -9,20 +11,9 @@ st.title("🎓 Student Dashboard")
 st.caption("AI-Powered Campus Event Participation System")
 
 # ------------------ LOAD DATA ------------------
-recs = pd.read_csv("outputs/hybrid_sports_recommendations.csv")
-
-# Convert lists if stored as strings
-if 'actual_participants' in recs.columns:
-    recs['actual_participants'] = recs['actual_participants'].apply(ast.literal_eval)
-
-# Round score to 2 decimals
-recs['score'] = recs['score'].round(2)
-
-# Add dummy upcoming date if not exists
-if 'event_date' not in recs.columns:
-    recs['event_date'] = pd.date_range(
-        start=datetime.today(), periods=len(recs), freq="3D"
-    )
+# Cached per data version: participant counts, rounded scores and
+# event dates are derived once, not on every click
+recs = data_cache.recommendations()[0]
 
 # Participation history stored in session
 if "history" not in st.session_state:
@@ -37,6 +28,22 @@ col3.metric("🪑 Seats Per Event", 50)
 
 st.divider()
 
+# ------------------ PERSONAL PICKS ------------------
+# Precomputed per student by `python -m models.recommender.recommendation_store`
+student_id = st.sidebar.number_input("Student ID", min_value=1, value=1, step=1)
+st.subheader("⭐ Top Picks For You")
+if os.path.exists(DEFAULT_DB):
+    picks = get_recommendations(student_id)
+    if picks.empty:
+        st.info("No recommendations stored for this student yet.")
+    else:
+        picks['score'] = picks['score'].round(2)
+        st.dataframe(picks[['rank', 'event_name', 'event_type', 'score']], hide_index=True, use_container_width=True)
+else:
+    st.info("Recommendation store not built yet. Run `python -m models.recommender.recommendation_store`.")
+
+st.divider()
+
 # ------------------ UPCOMING EVENTS ------------------
 st.subheader("📅 Recommended Events For You")
 
@@ -45,8 +52,8 @@ recs = recs.sort_values("score", ascending=False)
 
 for _, row in recs.iterrows():
     # Calculate current participants & remaining seats
-    current_participants = len(row['actual_participants']) if 'actual_participants' in row else 0
-    remaining_seats = 50 - current_participants  # assuming capacity 50
+    current_participants = row['current_participants']
+    remaining_seats = row['remaining_seats']  # assuming capacity 50
 
     with st.expander(f"🎫 {row['event_name']} | ⭐ {row['score']}"):
         left, right = st.columns([3, 1])
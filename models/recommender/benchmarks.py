@@ -0,0 +1,200 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from models.recommender import recommender_hybrid as rh
+from models.recommender.volunteer_assignment import VolunteerAssigner
+
+EVENT_TYPES = ["Tech", "Sports", "Music", "Cultural", "Art", "Drama"]
+
+
+def make_synthetic(n_students, n_events, attendance_per_student=10, seed=0):
+    """Random students/events/attendance frames shaped like the data/ CSVs."""
+    rng = np.random.default_rng(seed)
+    students = pd.DataFrame({
+        'student_id': np.arange(1, n_students + 1),
+        'interests': rng.choice(EVENT_TYPES, n_students),
+    })
+    events = pd.DataFrame({
+        'event_id': np.arange(1, n_events + 1),
+        'event_name': [f"Event {i}" for i in range(1, n_events + 1)],
+        'event_type': rng.choice(EVENT_TYPES, n_events),
+    })
+    attendance = pd.DataFrame({
+        'student_id': np.repeat(students['student_id'].to_numpy(), attendance_per_student),
+        'event_id': rng.integers(1, n_events + 1, n_students * attendance_per_student),
+    })
+    return students, events, attendance
+
+
+def use_data(students, events, attendance):
+    # The per-student API reads the module-level frames
+    rh.students, rh.events, rh.attendance = students, events, attendance
+    rh.participation_logs = attendance.iloc[:0]
+    rh._cf_model = None
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - start
+
+
+def run_batch_benchmark(n_students, n_events, loop_sample, top_n):
+    if n_students:
+        use_data(*make_synthetic(n_students, n_events))
+    n = len(rh.students)
+    sample = rh.students['student_id'].head(loop_sample).tolist()
+
+    # Like for like: recommend_top_n is the per-student form of the batch computation
+    loop, loop_s = timed(lambda: [rh.recommend_top_n(sid, top_n) for sid in sample])
+    loop_total = loop_s / len(sample) * n
+    batch, batch_s = timed(rh.recommend_all_students, top_n)
+
+    for sid, one in zip(sample, loop):
+        if batch.loc[batch['student_id'] == sid, 'event_id'].tolist() != one['event_id'].tolist():
+            raise AssertionError(f"batch and per-student top-{top_n} differ for student {sid}")
+
+    print(f"students={n} events={len(rh.events)}")
+    print(f"per-student loop : {loop_total:8.3f} s for all students (measured on {len(sample)})")
+    print(f"batch (NumPy)    : {batch_s:8.3f} s  -> {loop_total / batch_s:.0f}x faster")
+
+
+def make_candidate_events(n, n_venues=50, n_dates=30, seed=0):
+    """n random events with HH:MM times spread over venues and dates."""
+    rng = np.random.default_rng(seed)
+    start = rng.integers(8 * 60, 20 * 60, n)
+    end = start + rng.integers(30, 181, n)
+    fmt = lambda m: [f"{h:02d}:{mm:02d}" for h, mm in zip(m // 60, m % 60)]
+    return pd.DataFrame({
+        'event_id': np.arange(1, n + 1),
+        'location': rng.integers(0, n_venues, n).astype(str),
+        'date': pd.to_datetime("2026-01-01") + pd.to_timedelta(rng.integers(0, n_dates, n), unit="D"),
+        'start_time': fmt(start),
+        'end_time': fmt(end),
+    })
+
+
+def legacy_schedule(df):
+    """The original iterrows-based scheduler, kept here as the baseline."""
+    df = df.sort_values(by='end_time')
+    scheduled_events = []
+    last_end_time = "00:00"
+    for _, row in df.iterrows():
+        if row['start_time'] >= last_end_time:
+            scheduled_events.append(row)
+            last_end_time = row['end_time']
+    return pd.DataFrame(scheduled_events)
+
+
+def run_scheduler_benchmark(n_events, legacy_sample):
+    candidates = make_candidate_events(n_events)
+
+    sample = candidates.head(legacy_sample)
+    legacy, legacy_s = timed(legacy_schedule, sample)
+    fast, fast_sample_s = timed(rh.get_conflict_free_schedule, sample)
+    assert len(legacy) == len(fast), "vectorized scheduler disagrees with the legacy one"
+    print(f"{legacy_sample} events   : iterrows {legacy_s:.3f} s | vectorized {fast_sample_s:.4f} s")
+
+    for group_by in (None, 'location', 'date', ['location', 'date']):
+        result, elapsed = timed(rh.get_conflict_free_schedule, candidates, group_by=group_by)
+        print(f"{n_events} events, group_by={str(group_by):<20}: {elapsed:.3f} s, {len(result)} scheduled")
+
+    # Weighted DP and multi-room modes, scored by a random recommender score
+    candidates['score'] = np.random.default_rng(1).random(n_events)
+    for mode, rooms in (("greedy", 1), ("weighted", 1), ("greedy", 3), ("weighted", 3)):
+        result, elapsed = timed(rh.get_conflict_free_schedule, candidates, group_by='location', mode=mode, rooms=rooms)
+        print(f"mode={mode:<8} rooms={rooms}: {elapsed:.3f} s, {len(result)} scheduled, total score {result['score'].sum():.1f}")
+
+
+def make_volunteer_pool(n_volunteers, n_events, n_days=30, seed=0):
+    """Random volunteers.csv-like pool and dated events with expected attendance."""
+    rng = np.random.default_rng(seed)
+    volunteers = pd.DataFrame({
+        'student_id': np.arange(1, n_volunteers + 1),
+        'available': rng.random(n_volunteers) < 0.8,
+        'skill': rng.choice(["First Aid", "Logistics", "Organizing", "Tech Support"], n_volunteers),
+        'rating': rng.integers(30, 51, n_volunteers) / 10,
+    })
+    events = pd.DataFrame({
+        'event_id': np.arange(1, n_events + 1),
+        'event_type': rng.choice(EVENT_TYPES, n_events),
+        'date': pd.to_datetime("2026-01-01") + pd.to_timedelta(rng.integers(0, n_days, n_events), unit="D"),
+        'expected_attendance': rng.integers(20, 400, n_events),
+    })
+    return volunteers, events
+
+
+def run_volunteer_benchmark(n_volunteers, n_events, drops=5):
+    volunteers, events = make_volunteer_pool(n_volunteers, n_events)
+    assigner = VolunteerAssigner(volunteers, events)
+    _, elapsed = timed(assigner.solve)
+    print(f"volunteers={n_volunteers} events={n_events}: solved in {elapsed:.2f} s, "
+          f"{len(assigner.assigned)}/{assigner.required.sum()} slots filled, total {assigner.total_weight():.1f}")
+
+    busy = assigner.assignments()['student_id'].drop_duplicates().head(drops)
+    for student_id in busy:
+        added, elapsed = timed(assigner.drop_volunteer, student_id)
+        print(f"volunteer {student_id} dropped out: {len(added)} slots refilled in {elapsed * 1000:.1f} ms")
+
+
+def check_thread_safety(student_ids, threads=8, top_n=5):
+    """
+    Serves the same students serially and from a thread pool and checks the
+    answers match and that the shared events frame was never written to.
+    (tests/test_recommender_threads.py runs the same checks under pytest.)
+    """
+    events_before = rh.events.copy()
+    expected = {sid: rh.recommend_upcoming_events(sid, top_n) for sid in student_ids}
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        # Every student several times, interleaved, to provoke races
+        jobs = [sid for _ in range(4) for sid in student_ids]
+        answers = list(pool.map(lambda sid: (sid, rh.recommend_upcoming_events(sid, top_n)), jobs))
+
+    for sid, answer in answers:
+        pd.testing.assert_frame_equal(answer, expected[sid])
+    pd.testing.assert_frame_equal(rh.events, events_before)
+    if 'score' in rh.events.columns:
+        raise AssertionError("recommend_upcoming_events wrote a 'score' column into the shared events frame")
+    print(f"thread safety: {len(answers)} concurrent requests on {threads} threads match the serial results")
+
+
+def run_thread_benchmark(thread_counts, n_requests, top_n):
+    student_ids = rh.students['student_id'].tolist()
+    jobs = [student_ids[i % len(student_ids)] for i in range(n_requests)]
+    rh.get_cf_model()  # build once up front, not inside the timing
+
+    check_thread_safety(student_ids[:50], threads=max(thread_counts), top_n=top_n)
+    for threads in thread_counts:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            _, elapsed = timed(lambda: list(pool.map(lambda sid: rh.recommend_upcoming_events(sid, top_n), jobs)))
+        print(f"threads={threads:<3} {n_requests / elapsed:8.1f} requests/sec")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recommender benchmarks")
+    parser.add_argument("--students", type=int, default=0, help="synthetic roster size (0 = data/ CSVs)")
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--loop-sample", type=int, default=200, help="students timed in the per-student loop")
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--threads", type=int, nargs="+", help="run the thread-pool benchmark with these pool sizes")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per thread-pool run")
+    parser.add_argument("--scheduler", type=int, metavar="N", help="benchmark the scheduler on N candidate events")
+    parser.add_argument("--legacy-sample", type=int, default=5000, help="events given to the iterrows baseline")
+    parser.add_argument("--volunteers", type=int, metavar="N", help="benchmark volunteer assignment with N volunteers")
+    args = parser.parse_args()
+
+    if args.volunteers:
+        run_volunteer_benchmark(args.volunteers, args.events)
+    elif args.scheduler:
+        run_scheduler_benchmark(args.scheduler, args.legacy_sample)
+    elif args.threads:
+        if args.students:
+            use_data(*make_synthetic(args.students, args.events))
+        run_thread_benchmark(args.threads, args.requests, args.top_n)
+    else:
+        run_batch_benchmark(args.students, args.events, args.loop_sample, args.top_n)
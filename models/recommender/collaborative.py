@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class ItemItemCF:
+    """
+    Item-item collaborative filtering on a sparse student x event matrix.
+
+    fit() builds the interaction matrix from attendance / participation
+    rows, computes cosine similarity between events and keeps only the
+    top-k neighbours of every event. Scoring a student is then a sparse
+    row of their interactions times the sparse neighbour matrix, so memory
+    and time stay proportional to the number of non-zeros instead of
+    students x events.
+    """
+
+    def __init__(self, k=20):
+        self.k = k
+        self.student_index = None   # student_id -> row
+        self.event_index = None     # event_id -> column
+        self.interactions = None    # csr, students x events
+        self.neighbors = None       # csr, events x events (top-k cosine per row)
+
+    def fit(self, interactions, event_ids=None):
+        """
+        interactions: DataFrame with student_id, event_id and an optional weight column.
+        event_ids: fixes the column order (e.g. events.csv); unknown events are dropped.
+        """
+        if event_ids is None:
+            event_ids = pd.unique(interactions['event_id'])
+        self.event_index = pd.Index(event_ids)
+        self.student_index = pd.Index(pd.unique(interactions['student_id']))
+
+        rows = self.student_index.get_indexer(interactions['student_id'])
+        cols = self.event_index.get_indexer(interactions['event_id'])
+        weights = interactions['weight'].to_numpy(dtype=np.float32) if 'weight' in interactions else np.ones(len(interactions), dtype=np.float32)
+        known = cols >= 0
+
+        # Duplicate (student, event) pairs are summed by the COO -> CSR conversion
+        self.interactions = sparse.coo_matrix(
+            (weights[known], (rows[known], cols[known])),
+            shape=(len(self.student_index), len(self.event_index)),
+        ).tocsr()
+
+        # Cosine similarity between event columns
+        norms = np.sqrt(np.asarray(self.interactions.multiply(self.interactions).sum(axis=0))).ravel()
+        inv = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        normalized = self.interactions @ sparse.diags(inv)
+        similarity = (normalized.T @ normalized).tocsr()
+        similarity.setdiag(0)
+        similarity.eliminate_zeros()
+
+        self.neighbors = self._top_k(similarity, self.k)
+        return self
+
+    @staticmethod
+    def _top_k(matrix, k):
+        """Keeps the k largest entries of every row of a CSR matrix."""
+        indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+        keep = np.zeros(len(data), dtype=bool)
+        for row in range(matrix.shape[0]):
+            start, end = indptr[row], indptr[row + 1]
+            if end - start <= k:
+                keep[start:end] = True
+            else:
+                best = np.argpartition(-data[start:end], k)[:k]
+                keep[start + best] = True
+
+        row_ids = np.repeat(np.arange(matrix.shape[0]), np.diff(indptr))
+        return sparse.csr_matrix((data[keep], (row_ids[keep], indices[keep])), shape=matrix.shape)
+
+    def score_students(self, student_ids):
+        """
+        CF scores for several students: (len(student_ids) x events) sparse matrix.
+        Students without any history get an empty row.
+        """
+        rows = self.student_index.get_indexer(student_ids)
+        found = np.flatnonzero(rows >= 0)
+        # Sparse selector: one 1 per known student, unknown students stay all-zero rows.
+        # Also works when nothing was fitted yet (no logs / attendance: a 0-row matrix).
+        selector = sparse.csr_matrix(
+            (np.ones(len(found), dtype=np.float32), (found, rows[found])),
+            shape=(len(rows), self.interactions.shape[0]),
+        )
+        return (selector @ self.interactions @ self.neighbors).tocsr()
+
+    def score_student(self, student_id):
+        """CF scores for one student as a dense array aligned with the event columns."""
+        return self.score_students([student_id]).toarray().ravel()
+
+
+def build_interactions(attendance, logs=None, participation_weight=1.0):
+    """Stacks attendance (weight 1) and participation logs into one interaction table."""
+    frames = [attendance[['student_id', 'event_id']].assign(weight=1.0)]
+    if logs is not None and len(logs):
+        frames.append(logs[['student_id', 'event_id']].assign(weight=participation_weight))
+    return pd.concat(frames, ignore_index=True)
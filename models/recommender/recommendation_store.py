@@ -0,0 +1,368 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from models.recommender.collaborative import ItemItemCF, build_interactions
+from models.recommender import recommender_hybrid as rh
+
+DEFAULT_DB = "outputs/recommendations.db"
+SOURCES = {
+    "students": "data/students.csv",
+    "events": "data/events.csv",
+    "attendance": "data/attendance.csv",
+    "participation_logs": "data/participation_logs.csv",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recommendations (
+    student_id  INTEGER NOT NULL,
+    rank        INTEGER NOT NULL,
+    event_id    INTEGER NOT NULL,
+    event_name  TEXT,
+    event_type  TEXT,
+    score       REAL,
+    stale       INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id, rank)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL
+);
+"""
+
+
+def _hash_prefix(path, prefix=None):
+    """
+    One pass over a file: (sha256 of its first `prefix` bytes, sha256 of the
+    whole file, last byte of the prefix). Tells an append from a rewrite.
+    """
+    h = hashlib.sha256()
+    prefix_hash, prefix_end = None, b""
+    with open(path, "rb") as f:
+        if prefix:
+            remaining = prefix
+            while remaining > 0:
+                chunk = f.read(min(1 << 20, remaining))
+                if not chunk:
+                    break
+                h.update(chunk)
+                remaining -= len(chunk)
+                prefix_end = chunk[-1:]
+            if remaining == 0:
+                prefix_hash = h.hexdigest()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return prefix_hash, h.hexdigest(), prefix_end
+
+
+def _file_version(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _read_appended(path, offset):
+    """Rows after byte `offset` (a line boundary), parsed with the file's header."""
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(offset)
+        data = f.read()
+    return pd.read_csv(io.BytesIO(header + data))
+
+
+class RecommendationStore:
+    """
+    Materialized top-N recommendations for every student, one SQLite table
+    keyed by (student_id, rank).
+
+    refresh() remembers the size / row count / hash of every input CSV. When
+    a file only grew (new check-ins, new events, new students), just the
+    students those rows can affect are recomputed:
+      - new attendance / participation rows -> the students in those rows
+      - new students                        -> those students
+      - new events                          -> students for whom a new event
+                                               beats their current N-th pick
+    Anything else (edited or deleted rows, another top_n) rebuilds it all.
+    Dashboards then read one student with an indexed lookup via get().
+
+    Unchanged files are recognised by (size, mtime) alone and never re-read;
+    appended files are hashed once and only their new bytes are parsed. The
+    parsed frames and the CF model stay in memory between refreshes, and the
+    model is refit only when attendance / logs / events changed. A refit
+    shifts everyone's CF scores a little, so the rows of students that were
+    not recomputed are marked stale (refresh_stale() catches them up).
+    """
+
+    def __init__(self, path=DEFAULT_DB, sources=None):
+        self.path = path
+        self.sources = dict(SOURCES if sources is None else sources)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._frames = {}       # source -> (version, DataFrame) parsed so far
+        self._cf = (None, None)  # (input hashes, ItemItemCF)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        # Databases created before stale tracking existed
+        if "stale" not in [r[1] for r in conn.execute("PRAGMA table_info(recommendations)")]:
+            conn.execute("ALTER TABLE recommendations ADD COLUMN stale INTEGER NOT NULL DEFAULT 0")
+
+    def _conn(self):
+        # sqlite3 connections can't be shared between threads; keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------- Reads ----------
+    def get(self, student_id):
+        """One student's recommendations, best first (primary-key lookup, no scoring)."""
+        rows = self._conn().execute(
+            "SELECT student_id, rank, event_id, event_name, event_type, score FROM recommendations "
+            "WHERE student_id = ? ORDER BY rank", (int(student_id),)
+        ).fetchall()
+        return pd.DataFrame([dict(r) for r in rows],
+                            columns=['student_id', 'rank', 'event_id', 'event_name', 'event_type', 'score'])
+
+    def all(self):
+        return pd.read_sql_query("SELECT * FROM recommendations ORDER BY student_id, rank", self._conn())
+
+    def student_count(self):
+        return self._conn().execute("SELECT COUNT(DISTINCT student_id) FROM recommendations").fetchone()[0]
+
+    def stale_students(self):
+        """Students whose stored picks predate the current CF model."""
+        rows = self._conn().execute("SELECT DISTINCT student_id FROM recommendations WHERE stale = 1").fetchall()
+        return [r[0] for r in rows]
+
+    def _meta(self, key, default=None):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    # ---------- Change detection ----------
+    def _changes(self, state):
+        """
+        Per source: None (unchanged), the new rows (an append), or "rewrite".
+        An append means the old bytes are still an exact prefix of the file.
+        Files whose (size, mtime) match the stored state are not opened.
+        """
+        changes, new_state = {}, {}
+        for name, path in self.sources.items():
+            size, mtime_ns = _file_version(path)
+            old = state.get(name)
+            if old is not None and (old.get("size"), old.get("mtime_ns")) == (size, mtime_ns):
+                changes[name], new_state[name] = None, old
+                continue
+
+            prefix_hash, full_hash, prefix_end = _hash_prefix(path, old["size"] if old else None)
+            new_state[name] = {"size": size, "mtime_ns": mtime_ns, "sha256": full_hash}
+            if old is None:
+                changes[name] = "rewrite"
+            elif full_hash == old["sha256"]:
+                changes[name] = None        # touched, same bytes
+            elif size > old["size"] and prefix_hash == old["sha256"] and prefix_end == b"\n":
+                changes[name] = _read_appended(path, old["size"])
+            else:
+                changes[name] = "rewrite"
+
+            if changes[name] is None:
+                new_state[name]["rows"] = old["rows"]
+            elif isinstance(changes[name], str):
+                new_state[name]["rows"] = len(self._frame(name, new_state[name], reload=True))
+            else:
+                new_state[name]["rows"] = old["rows"] + len(changes[name])
+                self._extend_frame(name, old, new_state[name], changes[name])
+        return changes, new_state
+
+    def _frame(self, name, version, reload=False):
+        """Full parsed frame of a source at `version`, read from disk only if not cached."""
+        cached_version, frame = self._frames.get(name, (None, None))
+        if reload or cached_version != version:
+            frame = pd.read_csv(self.sources[name])
+            self._frames[name] = (version, frame)
+        return frame
+
+    def _extend_frame(self, name, old, new, new_rows):
+        cached_version, frame = self._frames.get(name, (None, None))
+        if cached_version == old:
+            self._frames[name] = (new, pd.concat([frame, new_rows], ignore_index=True))
+
+    def _cf_model(self, state):
+        """CF model over attendance + logs + events, refit only when one of them changed."""
+        key = [state[name]["sha256"] for name in ("attendance", "participation_logs", "events")]
+        if self._cf[0] != key:
+            attendance = self._frame("attendance", state["attendance"])
+            logs = self._frame("participation_logs", state["participation_logs"])
+            events = self._frame("events", state["events"])
+            model = ItemItemCF(k=20).fit(build_interactions(attendance, logs), event_ids=events['event_id'])
+            self._cf = (key, model)
+            return model, True
+        return self._cf[1], False
+
+    def _beaten_by_new_events(self, students, events, new_events, cf_model, top_n):
+        """Students whose current top-N would change because of the appended events."""
+        current = pd.read_sql_query(
+            "SELECT student_id, MIN(score) AS worst, COUNT(*) AS n FROM recommendations GROUP BY student_id",
+            self._conn(),
+        ).set_index('student_id')
+        ids = students['student_id'].to_numpy()
+
+        # Same score as recommend_all_students, but only for the new event columns
+        match = students['interests'].to_numpy()[:, None] == new_events['event_type'].to_numpy()[None, :]
+        scores = 0.5 + 0.5 * match.astype(np.float64)
+        raw = cf_model.score_students(ids).tocsr()
+        top = raw.max(axis=1).toarray().ravel()          # CF is scaled by the max over ALL events
+        cols = cf_model.event_index.get_indexer(new_events['event_id'])
+        cf = np.zeros(scores.shape, dtype=np.float32)
+        known = cols >= 0
+        cf[:, known] = raw[:, cols[known]].toarray()
+        cf = np.divide(cf, top[:, None], out=np.zeros_like(cf), where=top[:, None] > 0)
+        best_new = (scores + rh.CF_WEIGHT * cf).max(axis=1)
+
+        worst = current['worst'].reindex(ids).to_numpy()
+        full = current['n'].reindex(ids).fillna(0).to_numpy() >= min(top_n, len(events))
+        # Ties lose to the older event (stable ranking by events.csv order)
+        return set(ids[~full | (best_new > worst)].tolist())
+
+    # ---------- Writes ----------
+    def refresh(self, top_n=5, full=False):
+        """
+        Brings the table up to date with the CSVs. Returns the number of
+        students recomputed (0 if nothing changed).
+        """
+        with self._write_lock:
+            state = self._meta("sources", {})
+            changes, new_state = self._changes(state)
+            if self._meta("top_n") != top_n:
+                full = True
+            if not full and all(c is None for c in changes.values()):
+                return 0
+
+            students = self._frame("students", new_state["students"])
+            events = self._frame("events", new_state["events"])
+            cf_model, refit = self._cf_model(new_state)
+            # A model refit from unchanged inputs (new process) still counts as the same model
+            refit = refit and any(changes[n] is not None for n in ("attendance", "participation_logs", "events"))
+
+            new_events = changes["events"]
+            # A new Sports event can reshuffle anyone's conflict-free sports timetable
+            new_sports = isinstance(new_events, pd.DataFrame) and (new_events['event_type'] == 'Sports').any()
+            if full or new_sports or any(isinstance(c, str) for c in changes.values()):
+                affected = None
+            else:
+                affected = set()
+                for name in ("students", "attendance", "participation_logs"):
+                    if changes[name] is not None:
+                        affected.update(changes[name]['student_id'].tolist())
+                if new_events is not None:
+                    affected |= self._beaten_by_new_events(students, events, new_events, cf_model, top_n)
+
+            subset = students if affected is None else students[students['student_id'].isin(affected)]
+            self._recompute(subset, events, new_state, cf_model, top_n, replace_all=affected is None,
+                            mark_stale=refit and affected is not None)
+            return len(subset)
+
+    def refresh_stale(self, top_n=None, limit=None):
+        """
+        Recomputes up to `limit` students whose rows were marked stale by a CF
+        refit (all of them by default). Returns how many were recomputed.
+        top_n defaults to the stored one; another value rebuilds every
+        student, like refresh() does.
+        """
+        stored = self._meta("top_n")
+        if top_n is not None and top_n != stored:
+            # Another N changes everyone's rows, not only the stale ones
+            return self.refresh(top_n, full=True)
+        top_n = stored
+        with self._write_lock:
+            stale = self.stale_students()[:limit]
+            if not stale:
+                return 0
+            state = self._meta("sources", {})
+            students = self._frame("students", state["students"])
+            subset = students[students['student_id'].isin(stale)]
+            cf_model, _ = self._cf_model(state)
+            self._recompute(subset, self._frame("events", state["events"]), state, cf_model, top_n)
+            return len(subset)
+
+    def _recompute(self, subset, events, state, cf_model, top_n, replace_all=False, mark_stale=False):
+        attendance = self._frame("attendance", state["attendance"])
+        recs = rh.recommend_all_students(top_n, subset, events, attendance, cf_model) if len(subset) else None
+        self._write(recs, subset['student_id'].tolist(), replace_all, state, top_n, mark_stale)
+
+    def _write(self, recs, student_ids, replace_all, new_state, top_n, mark_stale=False):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if replace_all:
+                conn.execute("DELETE FROM recommendations")
+            else:
+                if mark_stale:
+                    # Everyone else was scored with the previous CF model
+                    conn.execute("UPDATE recommendations SET stale = 1")
+                conn.executemany("DELETE FROM recommendations WHERE student_id = ?", [(int(s),) for s in student_ids])
+            if recs is not None:
+                conn.executemany(
+                    "INSERT INTO recommendations (student_id, rank, event_id, event_name, event_type, score) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    zip(recs['student_id'].astype(int).tolist(), recs['rank'].astype(int).tolist(),
+                        recs['event_id'].astype(int).tolist(), recs['event_name'].tolist(),
+                        recs['event_type'].tolist(), recs['score'].astype(float).tolist()),
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("sources", json.dumps(new_state)), ("top_n", json.dumps(top_n))],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=DEFAULT_DB):
+    """Process-wide RecommendationStore per database file."""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = RecommendationStore(path)
+        return _stores[path]
+
+
+def get_recommendations(student_id, path=DEFAULT_DB):
+    """Precomputed recommendations for one student (empty until the store is refreshed)."""
+    return get_store(path).get(student_id)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Refresh the per-student recommendation store")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--full", action="store_true", help="recompute every student")
+    parser.add_argument("--stale", action="store_true", help="also recompute students marked stale by a CF refit")
+    parser.add_argument("--student", type=int, help="print this student's recommendations")
+    args = parser.parse_args()
+
+    store = RecommendationStore(args.db)
+    start = time.perf_counter()
+    updated = store.refresh(args.top_n, full=args.full)
+    if args.stale:
+        updated += store.refresh_stale(args.top_n)
+    print(f"Recomputed {updated} students in {time.perf_counter() - start:.2f} s "
+          f"({store.student_count()} students stored in {args.db}, {len(store.stale_students())} stale)")
+    if args.student is not None:
+        print(store.get(args.student).to_string(index=False))
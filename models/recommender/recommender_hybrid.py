@@ -1,66 +1,402 @@
 import pandas as pd
 import numpy as np
 import os
+import bisect
+import threading
+from scipy import sparse
+from models.recommender.collaborative import ItemItemCF, build_interactions
+from utils.attendance_feed import get_feed
+from utils import data_store
 
-# Load datasets
-students = pd.read_csv("data/students.csv")
-events = pd.read_csv("data/events.csv")
-attendance = pd.read_csv("data/attendance.csv")
+# Load datasets (typed Feather copies, rebuilt automatically when a CSV changes)
+students = data_store.load("students")
+events = data_store.load("events")
+# Check-ins are tailed: refresh_attendance() only parses rows appended since the last call
+attendance_feed = get_feed("data/attendance.csv")
+# None = use the live feed (indexed lookups); benchmarks / callers may set a frame instead
+attendance = None
+participation_logs = data_store.load("participation_logs")
 
-def get_conflict_free_schedule(df):
+# Weight of the collaborative-filtering score next to the 0.5/1.0 interest score
+CF_WEIGHT = 0.5
+_cf_model = None
+_cf_lock = threading.Lock()
+# Models fitted on caller-supplied frames (see build_cf_model)
+CF_FIT_CACHE_SIZE = 4
+_cf_fits = []
+
+def get_cf_model():
+    """Item-item CF model over attendance + participation logs, built on first use."""
+    global _cf_model
+    if _cf_model is None:
+        with _cf_lock:
+            # Only one thread builds it; the others wait and reuse it
+            if _cf_model is None:
+                interactions = build_interactions(attendance_frame(), participation_logs)
+                _cf_model = ItemItemCF(k=20).fit(interactions, event_ids=events['event_id'])
+    return _cf_model
+
+def build_cf_model(attendance_df=None, events_df=None):
+    """
+    CF model for the given frames: the shared cached model when both are the
+    module data, else a fit on what the caller passed in (their own
+    attendance replaces the module's attendance + participation logs).
+    Fits are memoised on the identity (and length) of the frames, so
+    per-request callers passing the same frames again don't refit.
+    """
+    if attendance_df is None and events_df is None:
+        return get_cf_model()
+    events_df = events if events_df is None else events_df
+    inputs = (attendance_frame(), participation_logs) if attendance_df is None else (attendance_df,)
+    frames = (*inputs, events_df)
+    lengths = tuple(len(f) for f in frames)
+
+    with _cf_lock:
+        for i, (cached, cached_lengths, model) in enumerate(_cf_fits):
+            if cached_lengths == lengths and all(a is b for a, b in zip(cached, frames)):
+                _cf_fits.insert(0, _cf_fits.pop(i))
+                return model
+        model = ItemItemCF(k=20).fit(build_interactions(*inputs), event_ids=events_df['event_id'])
+        # Most recent first; the frames are held so their ids can't be reused
+        _cf_fits.insert(0, (frames, lengths, model))
+        del _cf_fits[CF_FIT_CACHE_SIZE:]
+    return model
+
+def attendance_frame():
+    """All check-ins as a DataFrame: the frame set in `attendance`, else the feed's rows."""
+    return attendance_feed.frame() if attendance is None else attendance
+
+def refresh_attendance():
+    """
+    Pulls newly appended check-ins from the feed. The CF model is rebuilt
+    on next use only if something arrived. Returns the new rows.
+    """
+    global _cf_model
+    new_rows = attendance_feed.poll()
+    if len(new_rows):
+        with _cf_lock:
+            _cf_model = None
+    return new_rows
+
+def _attended_events(student_id):
+    """Events a student already attended."""
+    if attendance is None:
+        # Live feed: indexed lookup, no scan
+        return attendance_feed.attended(student_id)
+    return set(attendance.loc[attendance['student_id'] == student_id, 'event_id'])
+
+def cf_scores(student_ids, events_df=None, model=None):
+    """CF scores (students x events_df rows), scaled to [0, 1] per student."""
+    events_df = events if events_df is None else events_df
+    model = model or get_cf_model()
+    raw = model.score_students(student_ids)
+    # Re-align CF columns with events_df (a filtered/reordered events frame is fine)
+    cols = model.event_index.get_indexer(events_df['event_id'])
+    dense = np.zeros((len(student_ids), len(events_df)), dtype=np.float32)
+    known = cols >= 0
+    dense[:, known] = raw[:, cols[known]].toarray()
+    top = dense.max(axis=1, keepdims=True)
+    return np.divide(dense, top, out=np.zeros_like(dense), where=top > 0)
+
+def _to_minutes(times):
+    """'HH:MM' strings -> integer minutes since midnight (parsed once, vectorized)."""
+    parts = pd.Series(times).astype(str).str.split(':', n=1, expand=True)
+    return (parts[0].astype(np.int64) * 60 + parts[1].astype(np.int64)).to_numpy()
+
+def _greedy_pass(groups, starts, ends):
+    """Earliest-end-time greedy over arrays already sorted by (group, end)."""
+    keep = np.zeros(len(starts), dtype=bool)
+    last_group = None
+    last_end = 0
+    # Plain Python ints are much faster to loop over than NumPy scalars
+    for i, (g, s, e) in enumerate(zip(groups.tolist(), starts.tolist(), ends.tolist())):
+        if g != last_group:
+            last_group, last_end = g, 0
+        if s >= last_end:
+            keep[i] = True
+            last_end = e
+    return keep
+
+def _weighted_pass(groups, starts, ends, weights):
+    """
+    Weighted interval scheduling per group (arrays sorted by (group, end)):
+    DP over end-sorted events, predecessor found by binary search -> O(n log n).
+    Picks the conflict-free set with the highest total weight.
+    """
+    keep = np.zeros(len(starts), dtype=bool)
+    bounds = np.flatnonzero(np.diff(groups)) + 1
+    for lo, hi in zip([0, *bounds], [*bounds, len(starts)]):
+        s, e, w = starts[lo:hi], ends[lo:hi], weights[lo:hi]
+        n = hi - lo
+        # prev[i] = how many events end before event i starts (all of them come before i)
+        prev = np.minimum(np.searchsorted(e, s, side='right'), np.arange(n)).tolist()
+        w = w.tolist()
+
+        best = [0.0] * (n + 1)
+        take = [False] * n
+        for i in range(n):
+            with_i = w[i] + best[prev[i]]
+            if with_i > best[i]:
+                best[i + 1] = with_i
+                take[i] = True
+            else:
+                best[i + 1] = best[i]
+
+        # Walk back through the DP table to recover the chosen events
+        i = n
+        while i > 0:
+            if take[i - 1]:
+                keep[lo + i - 1] = True
+                i = prev[i - 1]
+            else:
+                i -= 1
+    return keep
+
+def _rooms_pass(groups, starts, ends, rooms):
+    """
+    Greedy interval partitioning onto `rooms` parallel resources per group
+    (arrays sorted by (group, end)). Each event goes to the room that became
+    free most recently before it starts, which maximizes the number of events.
+    Returns the room number per event (0 = not scheduled).
+    """
+    assigned = np.zeros(len(starts), dtype=np.int64)
+    last_group = None
+    free_at = []  # sorted (end_time, room)
+    for i, (g, s, e) in enumerate(zip(groups.tolist(), starts.tolist(), ends.tolist())):
+        if g != last_group:
+            last_group = g
+            free_at = [(0, r) for r in range(1, rooms + 1)]
+        # Best fit: the latest-ending room that is already free at s
+        pos = bisect.bisect_right(free_at, (s, rooms + 1)) - 1
+        if pos >= 0:
+            _, room = free_at.pop(pos)
+            assigned[i] = room
+            bisect.insort(free_at, (e, room))
+    return assigned
+
+def get_conflict_free_schedule(df, group_by=None, mode="greedy", rooms=1, weight_col='score'):
     """
     Sort by end time and remove overlaps.
     Handles dynamic time generation if columns are missing.
+
+    group_by: optional column(s), e.g. 'location' and/or 'date'. Each group
+    (venue, day, venue+day...) gets its own conflict-free schedule, all in
+    one sorted pass.
+    mode: "greedy" maximizes the NUMBER of events (earliest end time first),
+    "weighted" maximizes the total weight_col (the recommender score).
+    rooms: > 1 packs events onto that many parallel venues/slots per group and
+    adds a 'room' column. Greedy is optimal here; weighted runs the DP once
+    per room on what is left (a good heuristic, not an exact optimum).
     """
+    if mode not in ("greedy", "weighted"):
+        raise ValueError(f"Unknown scheduling mode: {mode}")
     if df.empty:
         return df
 
     # If times are missing, generate them dynamically based on length of df
     if 'start_time' not in df.columns:
-        # Create a list of start/end times that won't exceed the dataframe length
         # This creates slots: 09:00-10:00, 10:00-11:00, etc.
-        generated_starts = [f"{9 + i:02d}:00" for i in range(len(df))]
-        generated_ends = [f"{10 + i:02d}:00" for i in range(len(df))]
-        
+        hours = np.arange(len(df))
         df = df.copy() # Avoid SettingWithCopyWarning
-        df['start_time'] = generated_starts
-        df['end_time'] = generated_ends
-
-    # Greedy Algorithm: Sort by end_time to maximize non-conflicting events
-    df = df.sort_values(by='end_time')
-    scheduled_events = []
-    last_end_time = "00:00"
-
-    for _, row in df.iterrows():
-        if row['start_time'] >= last_end_time:
-            scheduled_events.append(row)
-            last_end_time = row['end_time']
-            
-    return pd.DataFrame(scheduled_events)
-
-def recommend_upcoming_events(student_id, top_n=5):
+        df['start_time'] = [f"{9 + i:02d}:00" for i in hours]
+        df['end_time'] = [f"{10 + i:02d}:00" for i in hours]
+
+    starts = _to_minutes(df['start_time'])
+    ends = _to_minutes(df['end_time'])
+    if group_by is None:
+        groups = np.zeros(len(df), dtype=np.int64)
+    else:
+        groups = df.groupby(group_by, sort=False).ngroup().to_numpy()
+
+    # Sort by (group, end_time): every pass below relies on this order
+    order = np.lexsort((ends, groups))
+    groups, starts, ends = groups[order], starts[order], ends[order]
+
+    if mode == "greedy":
+        if rooms == 1:
+            return df.iloc[order[_greedy_pass(groups, starts, ends)]]
+        room = _rooms_pass(groups, starts, ends, rooms)
+    else:
+        if weight_col not in df.columns:
+            raise ValueError(f"Weighted scheduling needs a '{weight_col}' column")
+        weights = df[weight_col].to_numpy(dtype=float)[order]
+        room = np.zeros(len(order), dtype=np.int64)
+        for r in range(1, rooms + 1):
+            left = np.flatnonzero(room == 0)
+            if len(left) == 0:
+                break
+            chosen = _weighted_pass(groups[left], starts[left], ends[left], weights[left])
+            room[left[chosen]] = r
+        if rooms == 1:
+            return df.iloc[order[room > 0]]
+
+    scheduled = room > 0
+    return df.iloc[order[scheduled]].assign(room=room[scheduled])
+
+def score_events(student_id, students_df=None, events_df=None, cf_model=None, attendance_df=None):
+    """
+    Hybrid score of every event (row of events_df) for one student.
+    Pure function: returns a new array and never writes to the shared frames,
+    so it is safe to call from many Streamlit sessions / threads at once.
+    Without cf_model, CF comes from the frames passed in (see build_cf_model).
+    """
+    if cf_model is None:
+        cf_model = build_cf_model(attendance_df, events_df)
+    students_df = students if students_df is None else students_df
+    events_df = events if events_df is None else events_df
+
     # 1. Content-Based Score (Interest Match)
-    student = students[students['student_id'] == student_id].iloc[0]
-    events['score'] = events['event_type'].apply(lambda x: 1.0 if x == student['interests'] else 0.5)
+    interest = students_df.loc[students_df['student_id'] == student_id, 'interests'].iloc[0]
+    scores = np.where(events_df['event_type'].to_numpy() == interest, 1.0, 0.5)
 
     # 2. Collaborative Filtering (Attendance Similarity)
-    # (Optional: Add your matrix-dot logic here if needed)
+    return scores + CF_WEIGHT * cf_scores([student_id], events_df, cf_model)[0]
+
+def _upcoming_candidates(student_id, schedule_mode="greedy", rooms=1):
+    """Scored non-attended events, split into the conflict-free sports timetable and the rest."""
+    scores = score_events(student_id)
 
     # 3. Filter only Upcoming/Non-attended
-    attended = attendance[attendance['student_id'] == student_id]['event_id'].tolist()
-    upcoming = events[~events['event_id'].isin(attended)].copy()
+    attended = list(_attended_events(student_id))
+    mask = ~events['event_id'].isin(attended).to_numpy()
+    # assign() builds a new frame; the module-level events frame is never touched
+    upcoming = events.loc[mask].assign(score=scores[mask])
 
     # 4. Apply Scheduling Algorithm (Constraint: No overlapping sports)
     sports_events = upcoming[upcoming['event_type'] == 'Sports']
     other_events = upcoming[upcoming['event_type'] != 'Sports']
     
     # Auto-create timetable for sports
-    timetable = get_conflict_free_schedule(sports_events)
-    
+    timetable = get_conflict_free_schedule(sports_events, mode=schedule_mode, rooms=rooms)
+    return timetable, other_events
+
+def recommend_upcoming_events(student_id, top_n=5, schedule_mode="greedy", rooms=1):
+    """
+    Top recommendations for one student. schedule_mode / rooms are passed to
+    get_conflict_free_schedule for the sports timetable ("weighted" keeps the
+    highest-scoring non-overlapping matches instead of the most matches).
+    """
+    timetable, other_events = _upcoming_candidates(student_id, schedule_mode, rooms)
+
     # Combine back
     final_recommendations = pd.concat([timetable, other_events.head(top_n-len(timetable))])
     return final_recommendations.sort_values(by='score', ascending=False)
 
+def recommend_top_n(student_id, top_n=5, schedule_mode="greedy", rooms=1):
+    """
+    Exactly the top_n best events for one student among the same candidates
+    (timetabled sports + other upcoming events); ties keep the events.csv order.
+    This is what recommend_all_students computes for every student at once.
+    """
+    timetable, other_events = _upcoming_candidates(student_id, schedule_mode, rooms)
+    candidates = pd.concat([timetable, other_events]).sort_index()
+    return candidates.sort_values(by='score', ascending=False, kind='stable').head(top_n)
+
+def _off_timetable(scores, events_df, schedule_mode="greedy", rooms=1):
+    """
+    (students x events) mask of the Sports events each student can still attend
+    but that are NOT in their conflict-free timetable: the same "no overlapping
+    sports" step recommend_upcoming_events applies. Attended events are -inf in
+    scores. Greedy timetables only depend on which Sports events are left, so
+    students with the same attended Sports events share one schedule call.
+    """
+    blocked = np.zeros(scores.shape, dtype=bool)
+    sports = np.flatnonzero(events_df['event_type'].to_numpy() == 'Sports')
+    if len(sports) == 0:
+        return blocked
+    # Positional index: the timetable's index says which Sports columns were kept
+    sports_events = events_df.iloc[sports].reset_index(drop=True)
+    sport_scores = scores[:, sports]
+    left = np.isfinite(sport_scores)
+
+    if schedule_mode == "greedy":
+        patterns, owner = np.unique(left, axis=0, return_inverse=True)
+        owner = owner.ravel()
+    else:
+        # Weighted picks depend on each student's own scores
+        patterns, owner = left, np.arange(len(left))
+    for p, pattern in enumerate(patterns):
+        who = np.flatnonzero(owner == p)
+        upcoming = sports_events[pattern].assign(score=sport_scores[who[0], pattern])
+        kept = np.zeros(len(sports), dtype=bool)
+        kept[get_conflict_free_schedule(upcoming, mode=schedule_mode, rooms=rooms).index] = True
+        blocked[np.ix_(who, sports)] = pattern & ~kept
+    return blocked
+
+def recommend_all_students(top_n=5, students_df=None, events_df=None, attendance_df=None, cf_model=None,
+                           schedule_mode="greedy", rooms=1):
+    """
+    Batch version of recommend_upcoming_events: top-N events for EVERY student in one pass.
+
+    Score matrix = interest one-hot (students x types) @ event-type one-hot (types x events),
+    i.e. 1.0 on an interest match and 0.5 otherwise, plus the CF score, same as the per-student score.
+    Attended events are masked out with a sparse (student, event) mask, and so are Sports events
+    outside the student's conflict-free timetable (schedule_mode / rooms as in recommend_upcoming_events).
+    Unlike recommend_upcoming_events, which returns the whole sports timetable plus other events,
+    this keeps exactly the top_n highest scores among those candidates (see recommend_top_n).
+    Returns a long DataFrame: student_id, rank, event_id, event_name, event_type, score.
+    """
+    if cf_model is None:
+        cf_model = build_cf_model(attendance_df, events_df)
+    students_df = students if students_df is None else students_df
+    events_df = events if events_df is None else events_df
+    attendance_df = attendance_frame() if attendance_df is None else attendance_df
+
+    # 1. Content-Based Score as a matrix product
+    types = pd.Index(pd.unique(pd.concat([events_df['event_type'], students_df['interests']])))
+    student_onehot = np.zeros((len(students_df), len(types)), dtype=np.float32)
+    student_onehot[np.arange(len(students_df)), types.get_indexer(students_df['interests'])] = 1.0
+    event_onehot = np.zeros((len(events_df), len(types)), dtype=np.float32)
+    event_onehot[np.arange(len(events_df)), types.get_indexer(events_df['event_type'])] = 1.0
+    # float64 like score_events, so near-ties rank the same in both paths
+    scores = 0.5 + 0.5 * (student_onehot @ event_onehot.T).astype(np.float64)
+
+    # + Collaborative Filtering (sparse neighbour lookups)
+    scores += CF_WEIGHT * cf_scores(students_df['student_id'].to_numpy(), events_df, cf_model)
+
+    # 2. Sparse attended mask -> -inf so those events never make the top-N
+    rows = pd.Index(students_df['student_id']).get_indexer(attendance_df['student_id'])
+    cols = pd.Index(events_df['event_id']).get_indexer(attendance_df['event_id'])
+    known = (rows >= 0) & (cols >= 0)
+    attended = sparse.coo_matrix(
+        (np.ones(known.sum(), dtype=bool), (rows[known], cols[known])), shape=scores.shape
+    ).tocsr()
+    attended_rows, attended_cols = attended.nonzero()
+    scores[attended_rows, attended_cols] = -np.inf
+
+    # 3. Constraint: no overlapping sports (same timetable as the per-student path)
+    scores[_off_timetable(scores, events_df, schedule_mode, rooms)] = -np.inf
+
+    # 4. Top-N per student without a full sort: argpartition finds each row's N-th best
+    # score, everything above it is in, and ties at it go to the earliest events.csv rows
+    top_n = min(top_n, scores.shape[1])
+    if top_n:
+        nth = np.argpartition(-scores, top_n - 1, axis=1)[:, top_n - 1:top_n]
+        cutoff = np.take_along_axis(scores, nth, axis=1)
+        above = scores > cutoff
+        tied = scores == cutoff
+        room = top_n - above.sum(axis=1, keepdims=True)
+        chosen = above | (tied & (np.cumsum(tied, axis=1) <= room))
+        top = np.nonzero(chosen)[1].reshape(len(scores), top_n)
+    else:
+        top = np.empty((len(scores), 0), dtype=np.int64)
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    # Only the N picks get sorted (stable: ties keep the events.csv order)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    result = pd.DataFrame({
+        'student_id': np.repeat(students_df['student_id'].to_numpy(), top_n),
+        'rank': np.tile(np.arange(1, top_n + 1), len(students_df)),
+        'event_idx': top.ravel(),
+        'score': top_scores.ravel(),
+    })
+    result = result[np.isfinite(result['score'])]
+    event_cols = events_df[['event_id', 'event_name', 'event_type']].reset_index(drop=True)
+    result = result.join(event_cols, on='event_idx').drop(columns='event_idx')
+    return result[['student_id', 'rank', 'event_id', 'event_name', 'event_type', 'score']].reset_index(drop=True)
+
 def generate_final_output():
     """Generates the single source of truth for the dashboard."""
     # Generate for a sample view
@@ -0,0 +1,264 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import linprog
+
+RECOMMENDATIONS_CSV = "outputs/hybrid_sports_recommendations.csv"
+ASSIGNMENTS_CSV = "outputs/volunteer_assignments.csv"
+
+# How well a volunteer skill fits an event type (0..1); unknown pairs get DEFAULT_FIT
+SKILL_FIT = {
+    "Sports":   {"First Aid": 1.0, "Logistics": 0.7, "Organizing": 0.5, "Tech Support": 0.3},
+    "Tech":     {"Tech Support": 1.0, "Organizing": 0.6, "Logistics": 0.5, "First Aid": 0.3},
+    "Music":    {"Tech Support": 0.8, "Organizing": 0.8, "Logistics": 0.7, "First Aid": 0.4},
+    "Cultural": {"Organizing": 1.0, "Logistics": 0.8, "Tech Support": 0.5, "First Aid": 0.4},
+    "Art":      {"Organizing": 1.0, "Logistics": 0.7, "Tech Support": 0.4, "First Aid": 0.3},
+    "Drama":    {"Tech Support": 0.8, "Organizing": 0.8, "Logistics": 0.7, "First Aid": 0.4},
+}
+DEFAULT_FIT = 0.5
+
+
+def required_volunteers(events, per_volunteer=50):
+    """Volunteers needed per event: a volunteers_needed column, else one per 50 expected attendees."""
+    if 'volunteers_needed' in events.columns:
+        return events['volunteers_needed'].fillna(1).astype(int).to_numpy()
+    if 'expected_attendance' in events.columns:
+        return np.maximum(1, np.ceil(events['expected_attendance'].fillna(0) / per_volunteer)).astype(int).to_numpy()
+    return np.ones(len(events), dtype=int)
+
+
+class VolunteerAssigner:
+    """
+    Assigns available volunteers to events to maximize sum(rating x skill fit).
+
+    Constraints: every volunteer works at most max_load events and at most
+    per_date events on the same day, and every event gets at most its
+    required number of volunteers. This is a min-cost flow
+    (source -> volunteer -> volunteer/day -> event -> sink); it is solved as
+    an LP with HiGHS, and because the constraint matrix is a network matrix
+    the optimal vertex is integral (every x is 0 or 1).
+
+    To keep the LP small it starts from each event's best
+    candidates_per_slot x required volunteers and adds more only where the
+    LP duals say they would help (column generation), so thousands of
+    volunteers x hundreds of events stay a few-thousand-edge LP.
+
+    drop_volunteer() refills only the slots the leaver held, with the spare
+    capacity of everyone else, so nobody else's assignment moves.
+    """
+
+    def __init__(self, volunteers, events, max_load=2, per_date=1, candidates_per_slot=10, max_rounds=50, skill_fit=None):
+        self.volunteers = volunteers[volunteers['available'].astype(bool)].reset_index(drop=True)
+        self.events = events.reset_index(drop=True)
+        self.max_load = max_load
+        self.per_date = per_date
+        self.candidates_per_slot = candidates_per_slot
+        self.max_rounds = max_rounds
+        self.skill_fit = SKILL_FIT if skill_fit is None else skill_fit
+
+        self.required = required_volunteers(self.events)
+        dates = (pd.to_datetime(self.events['date']).dt.normalize()
+                 if 'date' in self.events.columns else pd.Series(np.zeros(len(self.events))))
+        self.date_codes, uniques = pd.factorize(dates)
+        self.n_dates = max(len(uniques), 1)
+        self.weights = self._weight_matrix()
+        self.assigned = np.zeros((0, 2), dtype=np.int64)   # (volunteer row, event row) pairs
+
+    def _weight_matrix(self):
+        """volunteers x events matrix of rating * skill fit."""
+        skills = pd.Index(pd.unique(self.volunteers['skill']))
+        types = pd.Index(pd.unique(self.events['event_type']))
+        fit = np.full((len(skills), len(types)), DEFAULT_FIT)
+        for ti, event_type in enumerate(types):
+            for si, skill in enumerate(skills):
+                fit[si, ti] = self.skill_fit.get(event_type, {}).get(skill, DEFAULT_FIT)
+        fit = fit[skills.get_indexer(self.volunteers['skill'])][:, types.get_indexer(self.events['event_type'])]
+        # Ratings load as float32; round away the noise so weights read like the CSV
+        return np.round(self.volunteers['rating'].to_numpy(dtype=float)[:, None] * fit, 6)
+
+    def _candidates(self, event_rows, slots, score, allowed):
+        """Per event, the (at most candidates_per_slot x slots) allowed volunteers with the highest score."""
+        vol_idx, ev_idx = [], []
+        for e, need in zip(event_rows, slots):
+            pool = np.flatnonzero(allowed[:, e])
+            k = min(len(pool), self.candidates_per_slot * max(need, 1))
+            if k == 0:
+                continue
+            if k < len(pool):
+                pool = pool[np.argpartition(-score[pool, e], k - 1)[:k]]
+            vol_idx.append(pool)
+            ev_idx.append(np.full(len(pool), e))
+        if not vol_idx:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(vol_idx), np.concatenate(ev_idx)
+
+    def _solve_lp(self, vol_idx, ev_idx, load_left, slots_left, day_left):
+        """
+        Max-weight b-matching over the given edges. Returns the chosen edge
+        mask and the dual prices of the volunteer, event and volunteer/day rows.
+        """
+        n = len(vol_idx)
+        edges = np.arange(n)
+        day_key = vol_idx * self.n_dates + self.date_codes[ev_idx]
+
+        # One row per volunteer, per event, and per (volunteer, day)
+        vol_rows, vol_of_edge = np.unique(vol_idx, return_inverse=True)
+        ev_rows, ev_of_edge = np.unique(ev_idx, return_inverse=True)
+        day_rows, day_of_edge = np.unique(day_key, return_inverse=True)
+        A = sparse.vstack([
+            sparse.csr_matrix((np.ones(n), (vol_of_edge, edges)), shape=(len(vol_rows), n)),
+            sparse.csr_matrix((np.ones(n), (ev_of_edge, edges)), shape=(len(ev_rows), n)),
+            sparse.csr_matrix((np.ones(n), (day_of_edge, edges)), shape=(len(day_rows), n)),
+        ]).tocsr()
+        b = np.concatenate([load_left[vol_rows], slots_left[ev_rows], day_left.ravel()[day_rows]]).astype(float)
+
+        result = linprog(-self.weights[vol_idx, ev_idx], A_ub=A, b_ub=b, bounds=(0, 1), method="highs")
+        if result.status != 0:
+            raise RuntimeError(f"Volunteer assignment LP failed: {result.message}")
+
+        # marginals are <= 0 (minimization); flip them into prices >= 0
+        prices = -result.ineqlin.marginals
+        vol_price = np.zeros(len(self.volunteers))
+        ev_price = np.zeros(len(self.events))
+        day_price = np.zeros(len(self.volunteers) * self.n_dates)
+        vol_price[vol_rows] = prices[:len(vol_rows)]
+        ev_price[ev_rows] = prices[len(vol_rows):len(vol_rows) + len(ev_rows)]
+        day_price[day_rows] = prices[len(vol_rows) + len(ev_rows):]
+        return result.x > 0.5, vol_price, ev_price, day_price.reshape(len(self.volunteers), self.n_dates)
+
+    def _assign(self, event_rows, load_left, slots_left, day_left, allowed):
+        """
+        Column generation: solve the LP on each event's best candidates, then
+        price every other allowed (volunteer, event) pair with the duals and
+        add the ones that would improve the objective. Stops when none would,
+        which means the answer is optimal for the full problem.
+        """
+        event_rows = np.asarray(event_rows)
+        vol_idx, ev_idx = self._candidates(event_rows, slots_left[event_rows], self.weights, allowed)
+        if len(vol_idx) == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+        in_lp = np.zeros(allowed.shape, dtype=bool)
+
+        for _ in range(self.max_rounds):
+            in_lp[vol_idx, ev_idx] = True
+            chosen, vol_price, ev_price, day_price = self._solve_lp(vol_idx, ev_idx, load_left, slots_left, day_left)
+
+            # Reduced profit of a pair = weight - what its constraints are already "worth"
+            gain = np.full(allowed.shape, -np.inf)
+            cols = event_rows
+            gain[:, cols] = (self.weights[:, cols] - vol_price[:, None] - ev_price[None, cols]
+                             - day_price[:, self.date_codes[cols]])
+            gain[~allowed | in_lp] = -np.inf
+            new_vol, new_ev = self._candidates(event_rows, slots_left[event_rows], gain, gain > 1e-9)
+            if len(new_vol) == 0:
+                break
+            vol_idx, ev_idx = np.concatenate([vol_idx, new_vol]), np.concatenate([ev_idx, new_ev])
+
+        return np.column_stack([vol_idx[chosen], ev_idx[chosen]])
+
+    def _day_left(self, pairs):
+        """Per (volunteer, day) how many more events they may take."""
+        used = np.zeros(len(self.volunteers) * self.n_dates)
+        np.add.at(used, pairs[:, 0] * self.n_dates + self.date_codes[pairs[:, 1]], 1)
+        return self.per_date - used.reshape(len(self.volunteers), self.n_dates)
+
+    def solve(self):
+        """Full assignment from scratch. Returns it as a DataFrame (see assignments())."""
+        self.assigned = self._assign(
+            np.arange(len(self.events)),
+            np.full(len(self.volunteers), self.max_load),
+            self.required.copy(),
+            self._day_left(np.zeros((0, 2), dtype=np.int64)),
+            np.isfinite(self.weights),
+        )
+        return self.assignments()
+
+    def drop_volunteer(self, student_id):
+        """
+        Removes a volunteer and refills the slots they held from everyone
+        else's spare capacity. Returns the newly added assignment rows.
+        """
+        rows = np.flatnonzero(self.volunteers['student_id'].to_numpy() == student_id)
+        if len(rows) == 0:
+            return self._frame(np.zeros((0, 2), dtype=np.int64))
+        v = rows[0]
+        freed = self.assigned[self.assigned[:, 0] == v, 1]
+        self.assigned = self.assigned[self.assigned[:, 0] != v]
+        self.weights[v, :] = -np.inf   # never pick them again
+        if len(freed) == 0:
+            return self._frame(np.zeros((0, 2), dtype=np.int64))
+
+        # Spare capacity of everyone else; already-assigned pairs can't repeat
+        load_left = self.max_load - np.bincount(self.assigned[:, 0], minlength=len(self.volunteers))
+        slots_left = self.required - np.bincount(self.assigned[:, 1], minlength=len(self.events))
+        allowed = np.isfinite(self.weights) & (load_left[:, None] > 0)
+        allowed[self.assigned[:, 0], self.assigned[:, 1]] = False
+
+        added = self._assign(np.unique(freed), load_left, slots_left, self._day_left(self.assigned), allowed)
+        self.assigned = np.vstack([self.assigned, added])
+        return self._frame(added)
+
+    def _frame(self, pairs):
+        v, e = pairs[:, 0], pairs[:, 1]
+        return pd.DataFrame({
+            'event_id': self.events['event_id'].to_numpy()[e],
+            'student_id': self.volunteers['student_id'].to_numpy()[v],
+            'skill': self.volunteers['skill'].to_numpy()[v],
+            'rating': self.volunteers['rating'].to_numpy()[v],
+            'weight': self.weights[v, e],
+        })
+
+    def assignments(self):
+        """Current assignment, one (event_id, student_id, skill, rating, weight) row per slot filled."""
+        return self._frame(self.assigned).sort_values(['event_id', 'weight'], ascending=[True, False]).reset_index(drop=True)
+
+    def total_weight(self):
+        return float(self.weights[self.assigned[:, 0], self.assigned[:, 1]].sum())
+
+    def unfilled(self):
+        """event_id -> open slots, for events that couldn't be fully staffed."""
+        filled = np.bincount(self.assigned[:, 1], minlength=len(self.events))
+        short = self.required - filled
+        return pd.Series(short[short > 0], index=self.events['event_id'].to_numpy()[short > 0], name='open_slots')
+
+
+def update_recommendation_volunteers(assignments, path=RECOMMENDATIONS_CSV):
+    """Rewrites the assigned_volunteers column of the hybrid recommendations from the assignment."""
+    recs = pd.read_csv(path)
+    by_event = assignments.groupby('event_id')['student_id'].agg(lambda s: str(sorted(s.tolist())))
+    recs['assigned_volunteers'] = recs['event_id'].map(by_event).fillna("[]")
+    recs.to_csv(path, index=False)
+    return recs
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import time
+
+    from utils import data_store
+
+    parser = argparse.ArgumentParser(description="Assign available volunteers to events")
+    parser.add_argument("--scope", choices=["recommended", "all"], default="recommended",
+                        help="staff only the events in the hybrid recommendations, or every event")
+    parser.add_argument("--max-load", type=int, default=2, help="events per volunteer")
+    parser.add_argument("--update-recommendations", action="store_true",
+                        help=f"rewrite the assigned_volunteers column of {RECOMMENDATIONS_CSV}")
+    args = parser.parse_args()
+
+    events = data_store.load("events")
+    if args.scope == "recommended":
+        events = events[events['event_id'].isin(data_store.load("recommendations", columns=['event_id'])['event_id'])]
+
+    start = time.perf_counter()
+    assigner = VolunteerAssigner(data_store.load("volunteers"), events, max_load=args.max_load)
+    assignments = assigner.solve()
+    print(f"Assigned {len(assignments)} slots for {len(events)} events in {time.perf_counter() - start:.2f} s "
+          f"(total rating x fit {assigner.total_weight():.1f})")
+    if len(assigner.unfilled()):
+        print("Open slots:", assigner.unfilled().to_dict())
+
+    os.makedirs("outputs", exist_ok=True)
+    assignments.to_csv(ASSIGNMENTS_CSV, index=False)
+    if args.update_recommendations:
+        update_recommendation_volunteers(assignments)
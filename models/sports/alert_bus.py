@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+import weakref
+from collections import deque
+
+
+class Subscription:
+    """Mailbox of one subscriber. Holds at most maxlen undelivered events."""
+
+    def __init__(self, maxlen=100):
+        self._events = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def _deliver(self, event):
+        with self._lock:
+            self._events.append(event)
+        self._ready.set()
+
+    def pending(self):
+        return self._ready.is_set()
+
+    def drain(self):
+        """Returns and clears every event received since the last drain."""
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+            self._ready.clear()
+        return events
+
+    def wait(self, timeout=None):
+        """Blocks until something is published (or timeout). Returns the events."""
+        self._ready.wait(timeout)
+        return self.drain()
+
+
+class AlertBus:
+    """
+    In-process pub/sub for alert changes.
+
+    The alert store publishes {"type": "alert" | "ack", ...} after every
+    write, and dashboards subscribe so they redraw only when something
+    changed. Subscriptions are held weakly: once a Streamlit session (and
+    its feed) goes away it stops receiving events.
+    """
+
+    def __init__(self):
+        self._subscribers = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def subscribe(self, maxlen=100):
+        sub = Subscription(maxlen)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub._deliver(event)
+
+
+# Process-wide bus shared by the detectors and every dashboard page
+bus = AlertBus()
+
+
+def file_signature(path):
+    """(mtime, size) of a SQLite db and its WAL, so writes from other processes show up."""
+    signature = []
+    for p in (path, path + "-wal"):
+        try:
+            st = os.stat(p)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class AlertFeed:
+    """
+    What a dashboard holds on to: tells it when to redraw and caches the
+    active alerts in between.
+
+    Writes from this process arrive through the bus. Writes from other
+    processes (e.g. the headless monitor service) are picked up by a cheap
+    mtime/size check of the database files, rate-limited to min_interval.
+    The database is only queried again when one of the two reports a change.
+    """
+
+    def __init__(self, store, min_interval=0.5):
+        self.store = store
+        self.min_interval = min_interval
+        self.subscription = bus.subscribe()
+        self._signature = None
+        self._last_check = 0.0
+        self._alerts = None
+        self._dirty = True
+
+    def changed(self):
+        """True if alerts were added or acknowledged since the last call."""
+        if self.subscription.pending():
+            events = self.subscription.drain()
+            if any(e.get("db") == self.store.path for e in events):
+                # Our own process's write also touched the file; don't report it twice
+                self._signature = file_signature(self.store.path)
+                self._dirty = True
+                return True
+
+        now = time.monotonic()
+        if now - self._last_check < self.min_interval:
+            return False
+        self._last_check = now
+
+        signature = file_signature(self.store.path)
+        if signature != self._signature:
+            self._signature = signature
+            self._dirty = True
+            return True
+        return False
+
+    def active(self):
+        """Active alerts, re-queried only when something changed."""
+        self.changed()
+        if self._dirty or self._alerts is None:
+            self._alerts = self.store.active()
+            self._dirty = False
+        return self._alerts
@@ -0,0 +1,205 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from models.sports.alert_bus import bus
+
+DEFAULT_DB = "outputs/live_injury.db"
+LEGACY_JSON = "outputs/live_injury.json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at  REAL NOT NULL,
+    timestamp   TEXT NOT NULL,
+    event       TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    source      TEXT,
+    details     TEXT
+);
+CREATE TABLE IF NOT EXISTS acks (
+    alert_id    INTEGER PRIMARY KEY,
+    acked_at    REAL NOT NULL
+);
+"""
+
+
+class AlertStore:
+    """
+    Append-only injury alert log backed by a SQLite WAL database.
+
+    Writers only ever INSERT, so an alert costs O(1) no matter how long the
+    history is, and SQLite's locking makes it safe across processes (the
+    Streamlit app and the headless monitor service can share one file).
+    Readers ask for alerts after an id they've already seen instead of
+    re-parsing everything. Acknowledging ("Done") adds a row to acks and
+    never rewrites the alert itself; old history is removed by compact().
+    """
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        is_new = not os.path.exists(path)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        if is_new:
+            self._import_legacy_json(conn)
+
+    def _conn(self):
+        # sqlite3 connections can't be shared between threads; keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _import_legacy_json(self, conn):
+        """One-off import of the old outputs/live_injury.json list."""
+        legacy = os.path.join(os.path.dirname(self.path), os.path.basename(LEGACY_JSON))
+        if not os.path.exists(legacy):
+            return
+        try:
+            with open(legacy, "r") as f:
+                alerts = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return
+        if not isinstance(alerts, list):
+            return
+        for alert in alerts:
+            self.append(alert.get("event", "POTENTIAL_INJURY"), alert.get("status", "Critical"),
+                        source=alert.get("source"), timestamp=alert.get("timestamp"))
+
+    # ---------- Writes ----------
+    def append(self, event="POTENTIAL_INJURY", status="Critical", source=None, timestamp=None, **details):
+        """Adds one alert and returns its id. Extra keyword args are kept as JSON details."""
+        now = time.time()
+        cur = self._conn().execute(
+            "INSERT INTO alerts (created_at, timestamp, event, status, source, details) VALUES (?, ?, ?, ?, ?, ?)",
+            (now, timestamp or datetime.now().strftime("%H:%M:%S"), event, status, source,
+             json.dumps(details) if details else None),
+        )
+        bus.publish({"type": "alert", "id": cur.lastrowid, "source": source, "db": self.path})
+        return cur.lastrowid
+
+    def acknowledge(self, alert_id):
+        self._conn().execute(
+            "INSERT OR IGNORE INTO acks (alert_id, acked_at) VALUES (?, ?)", (int(alert_id), time.time())
+        )
+        bus.publish({"type": "ack", "id": int(alert_id), "db": self.path})
+
+    def acknowledge_all(self):
+        self._conn().execute(
+            "INSERT OR IGNORE INTO acks (alert_id, acked_at) SELECT id, ? FROM alerts", (time.time(),)
+        )
+        bus.publish({"type": "ack", "id": None, "db": self.path})
+
+    def compact(self, max_age_s=None, keep_last=None, acked_only=True):
+        """
+        Retention: drops alerts older than max_age_s and/or everything but the
+        newest keep_last. By default only acknowledged alerts are removed.
+        Returns the number of deleted alerts.
+        """
+        conditions, params = [], []
+        if max_age_s is not None:
+            conditions.append("created_at < ?")
+            params.append(time.time() - max_age_s)
+        if keep_last is not None:
+            conditions.append("id <= (SELECT COALESCE(MAX(id), 0) FROM alerts) - ?")
+            params.append(int(keep_last))
+        if not conditions:
+            return 0
+        if acked_only:
+            conditions.append("id IN (SELECT alert_id FROM acks)")
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = conn.execute(f"DELETE FROM alerts WHERE {' AND '.join(conditions)}", params)
+            conn.execute("DELETE FROM acks WHERE alert_id NOT IN (SELECT id FROM alerts)")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return cur.rowcount
+
+    # ---------- Reads ----------
+    def _rows(self, where="", params=(), order="a.id ASC", limit=None):
+        sql = (
+            "SELECT a.*, k.acked_at FROM alerts a LEFT JOIN acks k ON k.alert_id = a.id "
+            f"{where} ORDER BY {order}"
+        )
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        alerts = []
+        for row in self._conn().execute(sql, params):
+            alert = dict(row)
+            details = alert.pop("details")
+            if details:
+                alert.update(json.loads(details))
+            alert["acknowledged"] = alert["acked_at"] is not None
+            alerts.append(alert)
+        return alerts
+
+    def since(self, last_id=0, limit=None):
+        """Alerts with id > last_id, oldest first (tail -f style reads)."""
+        return self._rows("WHERE a.id > ?", (int(last_id),), limit=limit)
+
+    def tail(self, n=20, active_only=False):
+        """The newest n alerts, oldest first."""
+        where = "WHERE k.alert_id IS NULL" if active_only else ""
+        return list(reversed(self._rows(where, order="a.id DESC", limit=n)))
+
+    def active(self):
+        """Every alert nobody has acknowledged yet, oldest first."""
+        return self._rows("WHERE k.alert_id IS NULL")
+
+    def count(self, active_only=False):
+        if active_only:
+            sql = "SELECT COUNT(*) FROM alerts WHERE id NOT IN (SELECT alert_id FROM acks)"
+        else:
+            sql = "SELECT COUNT(*) FROM alerts"
+        return self._conn().execute(sql).fetchone()[0]
+
+    def last_id(self):
+        return self._conn().execute("SELECT COALESCE(MAX(id), 0) FROM alerts").fetchone()[0]
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=DEFAULT_DB):
+    """Process-wide AlertStore per database file."""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = AlertStore(path)
+        return _stores[path]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or compact the injury alert log")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--tail", type=int, default=10, help="print the newest N alerts")
+    parser.add_argument("--max-age-days", type=float, help="drop acknowledged alerts older than this")
+    parser.add_argument("--keep-last", type=int, help="drop acknowledged alerts beyond the newest N")
+    args = parser.parse_args()
+
+    store = AlertStore(args.db)
+    if args.max_age_days is not None or args.keep_last is not None:
+        max_age = args.max_age_days * 86400 if args.max_age_days is not None else None
+        print(f"Compacted {store.compact(max_age_s=max_age, keep_last=args.keep_last)} alerts")
+
+    for alert in store.tail(args.tail):
+        flag = "done" if alert["acknowledged"] else "ACTIVE"
+        print(f"#{alert['id']:<5} {alert['timestamp']} {alert['event']:<18} {alert.get('source') or '-':<20} {flag}")
@@ -0,0 +1,235 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import pandas as pd
+
+MANIFEST = "data/sports_videos.csv"
+VIDEO_DIR = "data/sports_videos"
+RESULTS_CSV = "outputs/video_analysis.csv"
+INTERVALS_CSV = "outputs/video_fall_intervals.csv"
+CACHE_FILE = "outputs/video_analysis_cache.json"
+RECOMMENDATIONS_CSV = "outputs/hybrid_sports_recommendations.csv"
+
+# Bump when the detection logic changes so cached results are recomputed
+ANALYZER_VERSION = 1
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def model_version(weights):
+    """Identifies the model + detector logic a cached result was produced with."""
+    weights_id = file_hash(weights)[:16] if os.path.exists(weights) else weights
+    return f"{weights_id}/v{ANALYZER_VERSION}"
+
+
+def _init_worker(threads):
+    # Every process runs its own model; don't let them all grab every core
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def _collect_falls(detector, timestamp, open_falls, intervals):
+    """Opens an interval when a player's alert fires and closes it once they recover."""
+    alive = set()
+    for track in detector.tracker.tracks:
+        alive.add(track.id)
+        if track.is_alerted and track.id not in open_falls:
+            # The alert fires fall_seconds after the player went down
+            open_falls[track.id] = max(0.0, timestamp - detector.fall_seconds)
+        elif not track.is_alerted and track.id in open_falls:
+            intervals.append((track.id, open_falls.pop(track.id), timestamp))
+
+    # Tracks that vanished while still down
+    for track_id in list(open_falls):
+        if track_id not in alive:
+            intervals.append((track_id, open_falls.pop(track_id), timestamp))
+
+
+def analyze_video(path, weights, batch_size=8):
+    """
+    Runs the fall detector over one video file (in a worker process).
+    Returns the frame count, duration and fall intervals per player.
+    """
+    from models.sports.injury_detection import FallDetector
+    from models.sports.motion_gate import MotionGate
+
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    detector = FallDetector(fps=fps, weights=weights, on_alert=None, motion_gate=MotionGate())
+
+    # process_batch hands frames back in order, so the timestamps line up
+    timestamps = []
+    def frames():
+        while cap.isOpened():
+            ret, frame = cap.read()
+            if not ret: break
+            timestamps.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+            yield frame, timestamps[-1]
+
+    open_falls = {}     # track_id -> start of an alerted fall (seconds)
+    intervals = []
+    frame_count = 0
+    timestamp = 0.0
+    start = time.perf_counter()
+
+    for _ in detector.process_batch(frames(), batch_size=batch_size):
+        timestamp = timestamps[frame_count]
+        frame_count += 1
+        _collect_falls(detector, timestamp, open_falls, intervals)
+    cap.release()
+
+    # Falls still in progress when the video ends
+    for track_id, fall_start in open_falls.items():
+        intervals.append((track_id, fall_start, timestamp))
+
+    return {
+        "frames": frame_count,
+        "duration_s": round(timestamp, 2),
+        "injuries": len(intervals),
+        "fall_intervals": [[tid, round(s, 2), round(e, 2)] for tid, s, e in sorted(intervals, key=lambda x: x[1])],
+        "inference_saved": round(detector.motion_gate.saved_fraction, 3),
+        "elapsed_s": round(time.perf_counter() - start, 2),
+    }
+
+
+def load_manifest(manifest=MANIFEST, video_dir=VIDEO_DIR):
+    """Videos listed in the archive CSV plus any mp4 in video_dir it doesn't mention."""
+    videos = pd.read_csv(manifest) if os.path.exists(manifest) else pd.DataFrame(columns=["video_id", "video_path"])
+    listed = set(os.path.normpath(p) for p in videos["video_path"])
+
+    extra = []
+    if os.path.isdir(video_dir):
+        for name in sorted(os.listdir(video_dir)):
+            path = os.path.normpath(os.path.join(video_dir, name))
+            if name.endswith(".mp4") and path not in listed:
+                extra.append({"video_path": path, "match_name": os.path.splitext(name)[0]})
+    if extra:
+        videos = pd.concat([videos, pd.DataFrame(extra)], ignore_index=True)
+    return videos
+
+
+def load_cache(path=CACHE_FILE):
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            pass
+    return {}
+
+
+def save_cache(cache, path=CACHE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp, path)
+
+
+def run_batch_analysis(videos, weights, workers=None, batch_size=8, use_cache=True):
+    """
+    Analyzes every video with a process pool. Results are cached by
+    (video content hash, model version), so unchanged files are skipped.
+    Returns (per-video results DataFrame, fall intervals DataFrame).
+    """
+    from models.sports.model_registry import DEFAULT_WEIGHTS
+
+    weights = weights or DEFAULT_WEIGHTS
+    version = model_version(weights)
+    cache = load_cache() if use_cache else {}
+    workers = workers or os.cpu_count() or 1
+
+    rows, todo = {}, {}
+    for i, video in videos.iterrows():
+        path = video["video_path"]
+        row = video.to_dict()
+        if not os.path.exists(path):
+            rows[i] = dict(row, status="missing")
+            continue
+        key = f"{file_hash(path)}:{version}"
+        if key in cache:
+            rows[i] = dict(row, status="cached", **cache[key])
+        else:
+            todo[i] = (row, key)
+
+    if todo:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(threads,)) as pool:
+            futures = {pool.submit(analyze_video, row["video_path"], weights, batch_size): i for i, (row, _) in todo.items()}
+            for future in as_completed(futures):
+                i = futures[future]
+                row, key = todo[i]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    rows[i] = dict(row, status=f"error: {e}")
+                    continue
+                cache[key] = result
+                rows[i] = dict(row, status="analyzed", **result)
+                print(f"analyzed {row['video_path']}: {result['injuries']} injuries in {result['elapsed_s']} s")
+        save_cache(cache)
+
+    results = pd.DataFrame([rows[i] for i in sorted(rows)])
+    intervals = []
+    for r in results.to_dict("records"):
+        falls = r.get("fall_intervals")
+        for tid, s, e in (falls if isinstance(falls, list) else []):
+            intervals.append({"video_id": r.get("video_id"), "video_path": r["video_path"], "track_id": tid, "start_s": s, "end_s": e})
+    intervals = pd.DataFrame(intervals, columns=["video_id", "video_path", "track_id", "start_s", "end_s"])
+    results = results.drop(columns=["fall_intervals"], errors="ignore")
+    return results, intervals
+
+
+def update_recommendation_injuries(results, path=RECOMMENDATIONS_CSV):
+    """
+    Recomputes the `injuries` column of the hybrid recommendations from the
+    analysis. Needs an event_id column in the video manifest to know which
+    event a match video belongs to.
+    """
+    if "event_id" not in results.columns:
+        print(f"{MANIFEST} has no event_id column; can't map videos to events, {path} left unchanged")
+        return None
+
+    counts = results.dropna(subset=["event_id"]).groupby("event_id")["injuries"].sum()
+    recs = pd.read_csv(path)
+    recs["injuries"] = recs["event_id"].map(counts).fillna(0).astype(int)
+    recs.to_csv(path, index=False)
+    return recs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline fall/injury analysis of the sports video archive")
+    parser.add_argument("--manifest", default=MANIFEST)
+    parser.add_argument("--video-dir", default=VIDEO_DIR)
+    parser.add_argument("--weights", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--no-cache", action="store_true", help="re-analyze every video")
+    parser.add_argument("--update-recommendations", action="store_true",
+                        help=f"recompute the injuries column of {RECOMMENDATIONS_CSV}")
+    args = parser.parse_args()
+
+    videos = load_manifest(args.manifest, args.video_dir)
+    results, intervals = run_batch_analysis(videos, args.weights, args.workers, args.batch_size, not args.no_cache)
+
+    os.makedirs("outputs", exist_ok=True)
+    results.to_csv(RESULTS_CSV, index=False)
+    intervals.to_csv(INTERVALS_CSV, index=False)
+    print(results.to_string(index=False))
+
+    if args.update_recommendations:
+        update_recommendation_injuries(results)
@@ -0,0 +1,112 @@
+import argparse
+import os
+import time
+
+import cv2
+
+from models.sports.injury_detection import FallDetector, detect_injury_batch, detect_injury_live
+from models.sports.motion_gate import MotionGate
+from models.sports.model_registry import DEFAULT_WEIGHTS, get_model, warmup_model
+
+VIDEO_DIR = "data/sports_videos"
+VIDEOS = ["Video1.mp4", "Video2.mp4", "Video3.mp4"]
+
+# Huge fps keeps the fall threshold out of reach so benchmarks never write alerts
+NO_ALERT_FPS = 1e9
+
+
+def load_frames(video_path, max_frames):
+    """Decodes up to max_frames frames so only inference is timed."""
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while cap.isOpened() and len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret: break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def bench_per_frame(frames):
+    fall_counter = 0
+    start = time.perf_counter()
+    for frame in frames:
+        _, fall_counter, _ = detect_injury_live(frame.copy(), fall_counter, NO_ALERT_FPS)
+    return len(frames) / (time.perf_counter() - start)
+
+
+def bench_batched(frames, batch_size):
+    start = time.perf_counter()
+    copies = (frame.copy() for frame in frames)
+    for _ in detect_injury_batch(copies, 0, NO_ALERT_FPS, batch_size=batch_size):
+        pass
+    return len(frames) / (time.perf_counter() - start)
+
+
+def run_batch_benchmark(batch_sizes, max_frames):
+    print(f"{'video':<12}{'mode':<14}{'frames/sec':>12}")
+    for name in VIDEOS:
+        path = os.path.join(VIDEO_DIR, name)
+        frames = load_frames(path, max_frames)
+        if not frames:
+            print(f"{name:<12}no frames decoded, skipping")
+            continue
+
+        # Warm-up so the first timed call doesn't pay for model/kernel setup
+        bench_per_frame(frames[:2])
+
+        print(f"{name:<12}{'per-frame':<14}{bench_per_frame(frames):>12.1f}")
+        for size in batch_sizes:
+            print(f"{name:<12}{f'batch={size}':<14}{bench_batched(frames, size):>12.1f}")
+
+
+def run_motion_benchmark(max_frames):
+    """Share of inference calls the motion gate saves on each video, and the resulting fps."""
+    print(f"{'video':<12}{'frames':>8}{'inferred':>10}{'saved':>8}{'fps':>8}")
+    for name in VIDEOS:
+        cap = cv2.VideoCapture(os.path.join(VIDEO_DIR, name))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        gate = MotionGate()
+        detector = FallDetector(fps=fps, motion_gate=gate, on_alert=None)
+
+        start = time.perf_counter()
+        while cap.isOpened() and gate.frames < max_frames:
+            ret, frame = cap.read()
+            if not ret: break
+            detector.process(frame, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+        elapsed = time.perf_counter() - start
+        cap.release()
+
+        print(f"{name:<12}{gate.frames:>8}{gate.inferred:>10}{gate.saved_fraction:>8.0%}{gate.frames / elapsed:>8.1f}")
+
+
+def run_cold_start_benchmark(weights):
+    """Times weight loading, warm-up and the first real frame after warm-up."""
+    start = time.perf_counter()
+    get_model(weights)
+    load_s = time.perf_counter() - start
+    warmup_s = warmup_model(weights)
+
+    frames = load_frames(os.path.join(VIDEO_DIR, VIDEOS[0]), 1)
+    start = time.perf_counter()
+    get_model(weights)(frames[0], classes=[0], verbose=False)
+    first_frame_s = time.perf_counter() - start
+
+    print(f"load: {load_s * 1000:.0f} ms | warm-up call: {warmup_s * 1000:.0f} ms | first frame after warm-up: {first_frame_s * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Injury detection benchmarks")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--max-frames", type=int, default=240)
+    parser.add_argument("--cold-start", action="store_true", help="only time model loading and warm-up")
+    parser.add_argument("--motion", action="store_true", help="report inference calls saved by motion gating")
+    parser.add_argument("--weights", default=DEFAULT_WEIGHTS)
+    args = parser.parse_args()
+
+    if args.cold_start:
+        run_cold_start_benchmark(args.weights)
+    elif args.motion:
+        run_motion_benchmark(args.max_frames)
+    else:
+        run_batch_benchmark(args.batch_sizes, args.max_frames)
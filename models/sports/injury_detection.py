@@ -1,74 +1,231 @@
-from ultralytics import YOLO
 import cv2
-import time
-import json
-import os
-from datetime import datetime
+from models.sports.alert_store import get_store
+from models.sports.model_registry import DEFAULT_WEIGHTS, get_model
+from models.sports.tracker import IoUTracker
+
+# Weights/device of detectors that don't name their own (and of the legacy API).
+# Each stream passes its own to FallDetector; the model itself is loaded lazily
+# (on the first frame) through the shared registry, not at import time.
+MODEL_WEIGHTS = DEFAULT_WEIGHTS
+MODEL_DEVICE = None
+
+def __getattr__(name):
+    # Keeps `from models.sports.injury_detection import model` working
+    if name == "model":
+        return get_model(MODEL_WEIGHTS, MODEL_DEVICE)
+    raise AttributeError(name)
+
+
+def write_alert(source=None, **details):
+    # One INSERT into the append-only alert log (no read-modify-write of a JSON file)
+    get_store().append("POTENTIAL_INJURY", "Critical", source=source, **details)
+
+
+class FallDetector:
+    """
+    Fall/injury detector for ONE video stream.
+
+    Players are followed with an IoU tracker, and every track keeps its own
+    fall timer and alert latch, so one player lying down and another
+    standing up no longer feed the same counter. Alerts carry the track id
+    and its bounding box.
+
+    Fall duration is measured in seconds from the frame timestamps, not in
+    frames, so it stays correct when frames are dropped or skipped. With a
+    motion_gate, frames that barely changed skip YOLO and reuse the previous
+    detections; while a fall is in progress every frame is inferred.
+
+    The YOLO model itself comes from the shared registry, which makes a
+    detector cheap to create: one worker can keep dozens of them and feed
+    them results from a single batched inference call (see update()).
+    """
+
+    def __init__(self, fps=30, fall_seconds=1.5, ratio_threshold=1.1, weights=None, device=None, source=None,
+                 on_alert=write_alert, motion_gate=None, max_dt=1.0):
+        self.fps = fps if fps else 30
+        self.source = source
+        self.fall_seconds = fall_seconds
+        self.ratio_threshold = ratio_threshold
+        self.weights = weights
+        self.device = device
+        self.on_alert = on_alert
+        self.motion_gate = motion_gate
+        # Longest gap between two frames that still counts fully towards a fall
+        self.max_dt = max_dt
+        self.tracker = IoUTracker()
+        self._last_time = None
+        self._synthetic_time = 0.0
+
+    @property
+    def model(self):
+        return get_model(self.weights or MODEL_WEIGHTS, self.device or MODEL_DEVICE)
+
+    @property
+    def fall_counter(self):
+        """Longest ongoing fall among the tracked players, in frames at the stream fps."""
+        return round(max((t.down_time for t in self.tracker.tracks), default=0.0) * self.fps)
+
+    @fall_counter.setter
+    def fall_counter(self, value):
+        """
+        Only a reset (0) is supported: fall time is kept per track. Handing back
+        the current value (what legacy callers do every frame) changes nothing;
+        any other value raises ValueError.
+        """
+        if value == 0:
+            for t in self.tracker.tracks:
+                t.down_time = 0.0
+        elif value != self.fall_counter:
+            raise ValueError(f"fall_counter can only be reset to 0 (got {value}, current {self.fall_counter})")
+
+    @property
+    def fall_in_progress(self):
+        return any(t.is_down or t.down_time > 0 for t in self.tracker.tracks)
+
+    def reset(self):
+        self.tracker.reset()
+        self._last_time = None
+        self._synthetic_time = 0.0
+
+    def frame_time(self, timestamp=None):
+        """Frame timestamp in seconds; without one we assume frames arrive at the nominal fps."""
+        if timestamp is None:
+            self._synthetic_time += 1.0 / self.fps
+            return self._synthetic_time
+        return timestamp
+
+    def _tick(self, timestamp):
+        """Seconds since the previous frame, capped at max_dt."""
+        dt = 0.0 if self._last_time is None else min(max(0.0, timestamp - self._last_time), self.max_dt)
+        self._last_time = timestamp
+        return dt
+
+    def _draw(self, frame):
+        for track in self.tracker.tracks:
+            if track.missed:
+                continue
+            x1, y1, x2, y2 = track.bbox
+            if track.is_down:
+                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
+                cv2.putText(frame, f"Fall Detected #{track.id}", (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
+            else:
+                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+                cv2.putText(frame, f"#{track.id}", (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
 
-model = YOLO("yolov8n.pt")
+    def _detections(self):
+        return [(t.id, t.bbox, t.is_down) for t in self.tracker.tracks if not t.missed]
 
-# Track if we are already alerted for the current fall
-is_currently_alerted = False 
+    def track_detections(self, result):
+        """Feeds one YOLO result to the tracker and flags players that are down."""
+        boxes = [tuple(map(int, box.xyxy[0])) for box in result.boxes]
+        tracks = self.tracker.update(boxes)
 
-def detect_injury_live(frame, fall_counter, fps):
-    global is_currently_alerted
-    results = model(frame, classes=[0], verbose=False)
-    found_down = False
-    limit = 1.5 * fps 
-
-    for r in results:
-        for box in r.boxes:
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
+        for track in self.tracker.tracks:
+            track.is_down = False
+        for (x1, y1, x2, y2), track in zip(boxes, tracks):
             w, h = x2 - x1, y2 - y1
             ratio = w / h if h > 0 else 0
-
-            if ratio > 1.1:
-                found_down = True
-                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
-                cv2.putText(frame, "Fall Detected", (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
+            track.is_down = ratio > self.ratio_threshold
+
+    def update_fall_state(self, dt):
+        """Advances every track's fall timer by dt seconds. Returns True when an alert fires."""
+        triggered = False
+        for track in self.tracker.tracks:
+            if track.is_down:
+                track.down_time += dt
             else:
-                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+                # Recover twice as fast as we accumulate (handles flickering boxes)
+                track.down_time = max(0.0, track.down_time - 2 * dt)
+                if track.down_time == 0:
+                    track.is_alerted = False
+
+            # Trigger alert logic (once per fall, per player)
+            if track.down_time >= self.fall_seconds and not track.is_alerted:
+                track.is_alerted = True 
+                triggered = True
+                if self.on_alert:
+                    self.on_alert(self.source, track_id=track.id, bbox=list(track.bbox))
+
+        return triggered
+
+    def needs_inference(self, frame, timestamp):
+        """Motion gate check: False means the previous detections can be reused."""
+        if self.motion_gate is None:
+            return True
+        return self.motion_gate.should_infer(frame, timestamp, force=self.fall_in_progress)
+
+    def update(self, frame, result, timestamp=None):
+        """
+        Applies an already computed YOLO result to this stream; result=None
+        reuses the previous detections (frame skipped by the motion gate).
+        Returns (frame, detections, fall_counter, is_injured).
+        """
+        if timestamp is None:
+            timestamp = self.frame_time()
+        dt = self._tick(timestamp)
+        if result is not None:
+            self.track_detections(result)
+        triggered = self.update_fall_state(dt)
+        self._draw(frame)
+        return frame, self._detections(), self.fall_counter, triggered
+
+    def process(self, frame, timestamp=None):
+        timestamp = self.frame_time(timestamp)
+        result = None
+        if self.needs_inference(frame, timestamp):
+            result = self.model(frame, classes=[0], verbose=False)[0]
+        return self.update(frame, result, timestamp)
+
+    def process_batch(self, frames, batch_size=8, max_latency=0.5):
+        """
+        Takes a list or iterator of frames (or (frame, timestamp) pairs), runs
+        YOLO on up to batch_size frames at once and yields
+        (frame, detections, fall_counter, is_injured) for every frame, in order.
+
+        The buffer is flushed once it holds batch_size frames (inferred or
+        skipped by the motion gate) or its oldest frame is max_latency seconds
+        old, whichever comes first, so a static scene can't stall the output.
+        While a fall is in progress every frame is flushed on its own: the
+        gate's force-inference check then always sees up-to-date tracks.
+        """
+        batch = []
+        for item in frames:
+            frame, timestamp = item if isinstance(item, tuple) else (item, None)
+            timestamp = self.frame_time(timestamp)
+            batch.append((frame, timestamp, self.needs_inference(frame, timestamp)))
+            if (len(batch) < batch_size and timestamp - batch[0][1] < max_latency
+                    and not self.fall_in_progress):
+                continue
+            yield from self._run_batch(batch)
+            batch = []
+
+        # Leftover frames at the end of the stream
+        if batch:
+            yield from self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        to_infer = [frame for frame, _, infer in batch if infer]
+        results = iter(self.model(to_infer, classes=[0], verbose=False) if to_infer else [])
+
+        # Results come back in the same order as the input frames
+        for frame, timestamp, infer in batch:
+            yield self.update(frame, next(results) if infer else None, timestamp)
+
+
+# Legacy function API: one shared detector, with the caller owning fall_counter
+_default_detector = FallDetector()
 
-    if found_down:
-        fall_counter += 1
-    else:
-        fall_counter = max(0, fall_counter - 2)
-        if fall_counter == 0:
-            is_currently_alerted = False
-
-    # Trigger alert logic
-    if fall_counter >= limit and not is_currently_alerted:
-        is_currently_alerted = True 
-        
-        alert_file = "outputs/live_injury.json"
-        os.makedirs("outputs", exist_ok=True)
-        
-        # 1. Create the new alert entry
-        new_event = {
-            "timestamp": datetime.now().strftime("%H:%M:%S"),
-            "event": "POTENTIAL_INJURY",
-            "status": "Critical"
-        }
-
-        # 2. LOAD EXISTING ALERTS (Appending logic)
-        alerts = []
-        if os.path.exists(alert_file):
-            try:
-                with open(alert_file, "r") as f:
-                    alerts = json.load(f)
-                    if not isinstance(alerts, list): # Ensure it's a list
-                        alerts = []
-            except (json.JSONDecodeError, IOError):
-                alerts = []
-
-        # 3. Add new event and Save
-        alerts.append(new_event)
-        with open(alert_file, "w") as f:
-            json.dump(alerts, f, indent=4)
-            
-        return frame, fall_counter, True 
-
-    return frame, fall_counter, False
+def detect_injury_live(frame, fall_counter, fps):
+    _default_detector.fps = fps
+    _default_detector.fall_counter = fall_counter
+    frame, _, fall_counter, triggered = _default_detector.process(frame)
+    return frame, fall_counter, triggered
+
+def detect_injury_batch(frames, fall_counter, fps, batch_size=8, max_latency=0.5):
+    """Batched version of detect_injury_live, yields (frame, detections, fall_counter, is_injured)."""
+    _default_detector.fps = fps
+    _default_detector.fall_counter = fall_counter
+    yield from _default_detector.process_batch(frames, batch_size=batch_size, max_latency=max_latency)
 
 
 # def detect_injury_live(frame, fall_counter, fps):
@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_WEIGHTS = "yolov8n.pt"
+
+# Process-wide cache: (weights, device, tag) -> loaded YOLO model
+_models = {}
+_stats = {}
+_lock = threading.Lock()
+
+
+def _key(weights, device, tag=None):
+    # Local files are keyed by absolute path so "./w.pt" and "w.pt" share a model.
+    # Plain names like "yolov8n.pt" are left alone (ultralytics downloads them).
+    if os.path.exists(weights):
+        weights = os.path.abspath(weights)
+    return weights, device or "auto", tag
+
+
+def get_model(weights=DEFAULT_WEIGHTS, device=None, warmup=False, tag=None):
+    """
+    Returns the YOLO model for (weights, device), loading it on first use.
+    Loaded models are shared by every caller in the process. warmup=True
+    warms the model up once, whoever loaded it.
+
+    YOLO predictors are not safe to call from several threads at once, so
+    parallel inference workers pass a tag (e.g. "worker-2") to get their own copy.
+    """
+    key = _key(weights, device, tag)
+    model = _models.get(key)
+    if model is None:
+        with _lock:
+            # Another thread may have loaded it while we waited
+            model = _models.get(key)
+            if model is None:
+                from ultralytics import YOLO
+
+                start = time.perf_counter()
+                model = YOLO(weights)
+                if device:
+                    model.to(device)
+                _stats[key] = {"load_s": time.perf_counter() - start, "warmup_s": None}
+                _models[key] = model
+
+    # Also when someone else loaded it first without warming it up
+    if warmup and _stats[key]["warmup_s"] is None:
+        warmup_model(weights, device, tag=tag)
+    return model
+
+
+def warmup_model(weights=DEFAULT_WEIGHTS, device=None, imgsz=640, runs=1, tag=None):
+    """
+    Runs dummy inference so the first real frame doesn't pay for
+    kernel selection and lazy allocations. Returns the first-call latency.
+    """
+    model = get_model(weights, device, tag=tag)
+    dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+
+    first = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        model(dummy, classes=[0], verbose=False)
+        if first is None:
+            first = time.perf_counter() - start
+
+    with _lock:
+        _stats[_key(weights, device, tag)]["warmup_s"] = first
+    return first
+
+
+def model_stats():
+    """Cold-start (load) and warm-up timings for every loaded model."""
+    with _lock:
+        return {f"{w} [{d}{'/' + t if t else ''}]": dict(s) for (w, d, t), s in _stats.items()}
+
+
+def clear_models():
+    with _lock:
+        _models.clear()
+        _stats.clear()
@@ -0,0 +1,306 @@
+import argparse
+import logging
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+from models.sports import injury_detection
+from models.sports.injury_detection import FallDetector, write_alert
+from models.sports.model_registry import get_model
+from models.sports.motion_gate import MotionGate
+
+log = logging.getLogger(__name__)
+
+
+class StreamSource:
+    """
+    One camera feed: a video file or an RTSP/HTTP URL.
+
+    A URL can be given a local file stand-in ("rtsp://cam1=data/sports_videos/Video1.mp4"),
+    which is used when the URL can't be opened. Files are paced at their own
+    fps when realtime is on, so they behave like a live camera.
+    """
+
+    def __init__(self, name, url, stand_in=None, realtime=True):
+        self.name = name
+        self.url = url
+        self.stand_in = stand_in
+        self.realtime = realtime
+
+        self.fps = 30
+        self.detector = None
+        self.opened_from = None
+
+        # Latest-wins slot: a live feed only cares about the newest frame
+        self.lock = threading.Lock()
+        self.pending = None          # (frame, capture_time, stream_timestamp)
+        self.busy = False            # a worker currently owns this stream
+        self.finished = False
+
+        self.started_at = None
+        self.decoded = 0
+        self.processed = 0
+        self.dropped = 0
+        self.alerts = 0
+        self.last_lag = 0.0
+
+    def open(self):
+        cap = cv2.VideoCapture(self.url)
+        self.opened_from = self.url
+        if not cap.isOpened() and self.stand_in:
+            cap = cv2.VideoCapture(self.stand_in)
+            self.opened_from = self.stand_in
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps else 30
+        return cap
+
+    @property
+    def is_file(self):
+        return os.path.exists(self.opened_from or "")
+
+    def stats(self):
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0
+        return {
+            "source": self.opened_from,
+            "decoded": self.decoded,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "alerts": self.alerts,
+            "fps": self.processed / elapsed if elapsed else 0.0,
+            "lag_ms": self.last_lag * 1000,
+            "inference_saved": self.detector.motion_gate.saved_fraction if self.detector and self.detector.motion_gate else 0.0,
+        }
+
+
+class MonitoringService:
+    """
+    Headless multi-camera injury monitor.
+
+    Every source gets a decoder thread and its own FallDetector. Frames are
+    scheduled onto a shared pool of inference workers: each worker grabs the
+    newest frame of up to batch_size ready streams, runs one batched YOLO
+    call on them and feeds each result back to that stream's detector.
+    A stream is only ever owned by one worker at a time, so its frames are
+    processed in order. With motion_gating, static frames skip YOLO.
+    weights / device pick the YOLO model (defaults: the detector's).
+    """
+
+    def __init__(self, sources, workers=None, batch_size=4, on_alert=None, motion_gating=True,
+                 weights=injury_detection.MODEL_WEIGHTS, device=injury_detection.MODEL_DEVICE):
+        self.sources = {s.name: s for s in sources}
+        self.weights = weights
+        self.device = device
+        self.motion_gating = motion_gating
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.on_alert = on_alert
+
+        self._ready = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+
+    # ---------- Public API ----------
+    def start(self):
+        self._limit_torch_threads()
+
+        for source in self.sources.values():
+            t = threading.Thread(target=self._decode_loop, args=(source,), daemon=True)
+            self._threads.append(t)
+            t.start()
+
+        for i in range(self.workers):
+            t = threading.Thread(target=self._infer_loop, args=(f"worker-{i}",), daemon=True)
+            self._threads.append(t)
+            t.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout=1)
+
+    def is_running(self):
+        return not self._stop.is_set() and not all(
+            s.finished and s.pending is None and not s.busy for s in self.sources.values()
+        )
+
+    def stats(self):
+        per_stream = {name: s.stats() for name, s in self.sources.items()}
+        total_fps = sum(s["fps"] for s in per_stream.values())
+        return {"streams": per_stream, "total_fps": total_fps, "workers": self.workers}
+
+    # ---------- Internals ----------
+    def _limit_torch_threads(self):
+        # Several workers each using every core just fight each other;
+        # split the cores between them instead.
+        try:
+            import torch
+            torch.set_num_threads(max(1, (os.cpu_count() or 1) // self.workers))
+        except ImportError:
+            pass
+
+    def _emit(self, source, **details):
+        source.alerts += 1
+        write_alert(source.name, **details)
+        if self.on_alert:
+            self.on_alert(source.name, dict(source.stats(), **details))
+
+    def _decode_loop(self, source):
+        cap = source.open()
+        source.detector = FallDetector(fps=source.fps, source=source.name, weights=self.weights, device=self.device,
+                                       on_alert=lambda _, **details: self._emit(source, **details),
+                                       motion_gate=MotionGate() if self.motion_gating else None)
+        source.started_at = time.perf_counter()
+        frame_interval = 1.0 / source.fps
+        next_frame_at = time.perf_counter()
+
+        try:
+            while cap.isOpened() and not self._stop.is_set():
+                ret, frame = cap.read()
+                if not ret: break
+                source.decoded += 1
+                captured_at = time.perf_counter()
+                # Fall timing uses the video clock for files, the wall clock for live feeds
+                stream_time = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0 if source.is_file else captured_at
+
+                with source.lock:
+                    if source.pending is not None:
+                        source.dropped += 1
+                    source.pending = (frame, captured_at, stream_time)
+                    schedule = not source.busy
+                    source.busy = True
+                if schedule:
+                    self._ready.put(source.name)
+
+                # Pace local files like a live camera
+                if source.realtime and source.is_file:
+                    next_frame_at += frame_interval
+                    delay = next_frame_at - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+        finally:
+            cap.release()
+            source.finished = True
+
+    def _claim_batch(self):
+        """Takes up to batch_size ready streams and their newest frames."""
+        try:
+            names = [self._ready.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        while len(names) < self.batch_size:
+            try:
+                names.append(self._ready.get_nowait())
+            except queue.Empty:
+                break
+
+        batch = []
+        for name in names:
+            source = self.sources[name]
+            with source.lock:
+                item, source.pending = source.pending, None
+            if item is None:
+                with source.lock:
+                    source.busy = False
+                continue
+            batch.append((source, *item))
+        return batch
+
+    def _release(self, source):
+        # Hand the stream back: re-queue it right away if a newer frame arrived
+        with source.lock:
+            if source.pending is not None:
+                requeue = True
+            else:
+                requeue = False
+                source.busy = False
+        if requeue:
+            self._ready.put(source.name)
+
+    def _infer_loop(self, tag):
+        model = get_model(self.weights, self.device, tag=tag)
+        while not self._stop.is_set():
+            batch = self._claim_batch()
+            if not batch:
+                continue
+
+            try:
+                self._run_batch(model, batch)
+            except Exception:
+                # One bad frame / model error must not take the worker down with it
+                log.exception("%s: inference failed for %s", tag, ", ".join(s.name for s, *_ in batch))
+            finally:
+                # Every claimed stream is handed back, whatever happened above
+                for source, *_ in batch:
+                    self._release(source)
+
+    def _run_batch(self, model, batch):
+        # Static frames (motion gate) reuse the previous detections and skip YOLO
+        to_infer = []
+        for source, frame, captured_at, stream_time in batch:
+            if source.detector.needs_inference(frame, stream_time):
+                to_infer.append((source, frame, captured_at, stream_time))
+            else:
+                self._finish(source, frame, None, captured_at, stream_time)
+
+        if to_infer:
+            results = model([frame for _, frame, _, _ in to_infer], classes=[0], verbose=False)
+            for (source, frame, captured_at, stream_time), r in zip(to_infer, results):
+                self._finish(source, frame, r, captured_at, stream_time)
+
+    def _finish(self, source, frame, result, captured_at, stream_time):
+        source.detector.update(frame, result, stream_time)
+        source.processed += 1
+        source.last_lag = time.perf_counter() - captured_at
+
+
+def parse_source(spec, index):
+    """
+    'url' or 'url=stand_in_file' -> StreamSource. The split is on the LAST
+    '=' and only if what follows is an existing file, so URLs with query
+    strings (rtsp://cam/stream?channel=1) stay intact.
+    """
+    url, _, stand_in = spec.rpartition("=")
+    if not url or not os.path.isfile(stand_in):
+        url, stand_in = spec, None
+    name = os.path.splitext(os.path.basename(url.split("?")[0].rstrip("/")))[0] or f"cam{index}"
+    return StreamSource(f"{index}:{name}", url, stand_in or None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless multi-camera injury monitoring")
+    parser.add_argument("sources", nargs="*", help="video files or rtsp://... URLs, optionally url=local_file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--weights", default=injury_detection.MODEL_WEIGHTS, help="YOLO weights file")
+    parser.add_argument("--no-realtime", action="store_true", help="decode files as fast as possible")
+    parser.add_argument("--no-motion-gate", action="store_true", help="run YOLO on every frame")
+    parser.add_argument("--report-every", type=float, default=2.0, help="seconds between stats reports")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    specs = args.sources or [os.path.join("data/sports_videos", v) for v in sorted(os.listdir("data/sports_videos")) if v.endswith(".mp4")]
+    sources = [parse_source(spec, i) for i, spec in enumerate(specs)]
+    for s in sources:
+        s.realtime = not args.no_realtime
+
+    def print_alert(name, stats):
+        print(f"🚨 POTENTIAL_INJURY on {name}, player #{stats.get('track_id')} at {stats.get('bbox')} (lag {stats['lag_ms']:.0f} ms)")
+
+    service = MonitoringService(sources, workers=args.workers, batch_size=args.batch_size, on_alert=print_alert,
+                                motion_gating=not args.no_motion_gate, weights=args.weights).start()
+    try:
+        while service.is_running():
+            time.sleep(args.report_every)
+            report = service.stats()
+            print(f"--- total {report['total_fps']:.1f} fps on {report['workers']} workers")
+            for name, s in report["streams"].items():
+                print(f"{name:<20} {s['fps']:6.1f} fps | lag {s['lag_ms']:6.0f} ms | dropped {s['dropped']} | inference saved {s['inference_saved']:.0%}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Cheap pre-filter in front of YOLO.
+
+    Each frame is shrunk to a small grayscale thumbnail and compared with
+    the thumbnail of the last frame that actually went through inference.
+    If too few pixels changed, the frame is "static" and the previous
+    detections can be reused. Because the reference is the last *inferred*
+    frame, slow drift still adds up and eventually triggers inference, and
+    max_skip_s forces a fresh inference at least that often anyway.
+    """
+
+    def __init__(self, width=160, pixel_threshold=25, motion_fraction=0.01, max_skip_s=1.0):
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.motion_fraction = motion_fraction
+        self.max_skip_s = max_skip_s
+
+        self._reference = None
+        self._reference_time = None
+        self.frames = 0
+        self.inferred = 0
+
+    def _thumbnail(self, frame):
+        h, w = frame.shape[:2]
+        size = (self.width, max(1, int(h * self.width / w)))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def should_infer(self, frame, timestamp, force=False):
+        """True if this frame needs a real YOLO pass."""
+        self.frames += 1
+        thumb = self._thumbnail(frame)
+
+        infer = (
+            force
+            or self._reference is None
+            or thumb.shape != self._reference.shape
+            or timestamp - self._reference_time >= self.max_skip_s
+        )
+        if not infer:
+            changed = np.count_nonzero(cv2.absdiff(thumb, self._reference) > self.pixel_threshold)
+            infer = changed > self.motion_fraction * thumb.size
+
+        if infer:
+            self._reference = thumb
+            self._reference_time = timestamp
+            self.inferred += 1
+        return infer
+
+    @property
+    def saved_fraction(self):
+        """Share of frames whose inference call was skipped."""
+        return 1 - self.inferred / self.frames if self.frames else 0.0
+
+    def stats(self):
+        return {"frames": self.frames, "inferred": self.inferred, "saved_fraction": self.saved_fraction}
@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class Track:
+    """One player followed across frames, with its own fall state."""
+
+    def __init__(self, track_id, bbox):
+        self.id = track_id
+        self.bbox = bbox            # (x1, y1, x2, y2)
+        self.missed = 0             # consecutive frames without a matching box
+        self.hits = 1
+        self.is_down = False
+        self.down_time = 0.0        # seconds spent down in the current fall
+        self.is_alerted = False
+
+
+def iou_matrix(a, b):
+    """Pairwise IoU between boxes a (N x 4) and b (M x 4), both x1, y1, x2, y2."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)))
+    a = np.asarray(a, dtype=np.float32)[:, None, :]
+    b = np.asarray(b, dtype=np.float32)[None, :, :]
+
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-6)
+
+
+class IoUTracker:
+    """
+    Lightweight IoU tracker: matches this frame's boxes to existing tracks
+    greedily by highest IoU, starts new tracks for unmatched boxes and drops
+    tracks that haven't been seen for max_missed frames. One IoU matrix per
+    frame, so it costs next to nothing compared to YOLO itself.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_missed=15):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.tracks = []
+        self._next_id = 1
+
+    def update(self, boxes):
+        """
+        boxes: list of (x1, y1, x2, y2) for this frame.
+        Returns the matched/new track for every box, in the same order.
+        """
+        ious = iou_matrix([t.bbox for t in self.tracks], boxes)
+        assigned = [None] * len(boxes)
+        used_tracks = set()
+
+        if ious.size:
+            # Greedy: best overlaps first
+            order = np.argsort(-ious, axis=None)
+            for flat in order:
+                ti, bi = np.unravel_index(flat, ious.shape)
+                if ious[ti, bi] < self.iou_threshold:
+                    break
+                if ti in used_tracks or assigned[bi] is not None:
+                    continue
+                track = self.tracks[ti]
+                track.bbox = boxes[bi]
+                track.missed = 0
+                track.hits += 1
+                assigned[bi] = track
+                used_tracks.add(ti)
+
+        for ti, track in enumerate(self.tracks):
+            if ti not in used_tracks:
+                track.missed += 1
+
+        for bi, box in enumerate(boxes):
+            if assigned[bi] is None:
+                track = Track(self._next_id, box)
+                self._next_id += 1
+                self.tracks.append(track)
+                assigned[bi] = track
+
+        self.tracks = [t for t in self.tracks if t.missed <= self.max_missed]
+        return assigned
+
+    def reset(self):
+        self.tracks = []
+        self._next_id = 1
@@ -0,0 +1,236 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+from models.sports.injury_detection import FallDetector
+from models.sports.motion_gate import MotionGate
+
+log = logging.getLogger(__name__)
+
+# Marks the end of the stream inside the queues
+_END = object()
+
+
+class VideoPipeline:
+    """
+    Decode -> infer -> render pipeline for one video.
+
+    A decoder thread reads frames into a bounded queue, an inference thread
+    runs the injury detector on them and pushes annotated RGB frames into a
+    second bounded queue, and the caller (the Streamlit page) iterates over
+    the pipeline to render. Frames are only dropped when inference falls
+    behind (the frame queue is full), according to drop_policy:
+
+    * "latest"  - keep only the newest frames, dropping the oldest queued one
+    * "every_k" - drop new frames, but every k-th one waits for room, so
+                  inference still sees at least every k-th frame
+
+    With motion_gating, frames that barely changed skip YOLO entirely and
+    reuse the previous detections (see MotionGate). With realtime, video
+    files are decoded at their own fps like a live camera, so frames are
+    only dropped when inference is slower than real time.
+
+    weights / device pick the YOLO model for this stream only (None = the
+    detector defaults), so sessions never switch each other's model.
+
+    If inference fails, the exception is logged, the stream ends and
+    iterating over the pipeline re-raises it.
+    """
+
+    def __init__(self, video_path, batch_size=1, queue_size=8, drop_policy="latest", every_k=2, motion_gating=False,
+                 realtime=True, weights=None, device=None):
+        if drop_policy not in ("latest", "every_k"):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+
+        self.video_path = video_path
+        self.batch_size = batch_size
+        self.drop_policy = drop_policy
+        self.every_k = max(1, int(every_k))
+        self.motion_gating = motion_gating
+        self.realtime = realtime
+        self.weights = weights
+        self.device = device
+
+        self.frame_queue = queue.Queue(maxsize=queue_size)
+        self.result_queue = queue.Queue(maxsize=queue_size)
+        self.fps = 30
+        # Each pipeline gets its own detector, so alert state is per stream
+        self.detector = None
+        self.error = None  # exception that stopped inference, re-raised by __iter__
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stats = {
+            "decoded": 0,          # frames read from the video
+            "dropped": 0,          # frames discarded by the drop policy
+            "inferred": 0,         # frames that went through the detector
+            "rendered": 0,         # frames handed to the UI
+            "decode_s": 0.0,       # time spent in cap.read()
+            "decode_blocked_s": 0.0,  # decoder waiting on a full frame queue
+            "infer_s": 0.0,        # time spent in the detector
+            "infer_starved_s": 0.0,   # inference waiting for frames
+            "infer_blocked_s": 0.0,   # inference waiting on a full result queue
+            "render_starved_s": 0.0,  # UI waiting for results
+        }
+
+    # ---------- Public API ----------
+    def start(self):
+        cap = cv2.VideoCapture(self.video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps else 30
+        # Frames carry their video timestamp, so dropped frames don't distort fall timing
+        self.detector = FallDetector(fps=self.fps, weights=self.weights, device=self.device,
+                                     motion_gate=MotionGate() if self.motion_gating else None)
+
+        self._threads = [
+            threading.Thread(target=self._decode_loop, args=(cap,), daemon=True),
+            threading.Thread(target=self._infer_loop, daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout=1)
+
+    def stats(self):
+        """Snapshot of the backpressure counters plus current queue depths."""
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot["frame_queue"] = self.frame_queue.qsize()
+        snapshot["result_queue"] = self.result_queue.qsize()
+        if self.detector and self.detector.motion_gate:
+            snapshot["inference_saved"] = round(self.detector.motion_gate.saved_fraction, 3)
+        return snapshot
+
+    def __iter__(self):
+        """Yields (frame_rgb, detections, fall_counter, is_injured) in order."""
+        while True:
+            item = self._get(self.result_queue, "render_starved_s")
+            if item is _END:
+                if self.error is not None:
+                    raise self.error
+                break
+            self._add("rendered", 1)
+            yield item
+
+    # ---------- Workers ----------
+    def _add(self, key, value):
+        with self._lock:
+            self._stats[key] += value
+
+    def _put(self, q, item, blocked_key):
+        """Blocking put that still notices stop(). Returns False if stopped."""
+        start = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                self._add(blocked_key, time.perf_counter() - start)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _decode_loop(self, cap):
+        skipped = 0  # every_k: frames dropped in a row since the last queued one
+        pace = self.realtime and os.path.isfile(self.video_path)
+        frame_interval = 1.0 / self.fps
+        next_frame_at = time.perf_counter()
+        try:
+            while cap.isOpened() and not self._stop.is_set():
+                # Pace local files like a live camera (same as MonitoringService)
+                if pace:
+                    delay = next_frame_at - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_frame_at += frame_interval
+
+                start = time.perf_counter()
+                ret, frame = cap.read()
+                self._add("decode_s", time.perf_counter() - start)
+                if not ret: break
+                self._add("decoded", 1)
+                item = (frame, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+
+                if self.drop_policy == "every_k":
+                    try:
+                        self.frame_queue.put_nowait(item)
+                        skipped = 0
+                        continue
+                    except queue.Full:
+                        pass
+                    # Inference is behind: drop, except every k-th frame blocks until there is room
+                    skipped += 1
+                    if skipped < self.every_k:
+                        self._add("dropped", 1)
+                        continue
+                    if not self._put(self.frame_queue, item, "decode_blocked_s"):
+                        break
+                    skipped = 0
+                else:
+                    # Keep latest: make room by throwing away the oldest queued frame
+                    while True:
+                        try:
+                            self.frame_queue.put_nowait(item)
+                            break
+                        except queue.Full:
+                            try:
+                                self.frame_queue.get_nowait()
+                                self._add("dropped", 1)
+                            except queue.Empty:
+                                pass
+        finally:
+            cap.release()
+            self._put(self.frame_queue, _END, "decode_blocked_s")
+
+    def _get(self, q, starved_key):
+        """Blocking get that still notices stop(). Returns _END if stopped."""
+        start = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                item = q.get(timeout=0.1)
+                self._add(starved_key, time.perf_counter() - start)
+                return item
+            except queue.Empty:
+                continue
+        return _END
+
+    def _input_frames(self):
+        while True:
+            item = self._get(self.frame_queue, "infer_starved_s")
+            if item is _END:
+                return
+            yield item
+
+    def _infer_loop(self):
+        results = self.detector.process_batch(self._input_frames(), batch_size=self.batch_size)
+        try:
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                starved_before = self._stats["infer_starved_s"]
+                try:
+                    frame, detections, fall_counter, is_injured = next(results)
+                except StopIteration:
+                    break
+                # Only count time actually spent in the detector, not waiting for frames
+                busy = time.perf_counter() - start - (self._stats["infer_starved_s"] - starved_before)
+                self._add("infer_s", max(0.0, busy))
+                self._add("inferred", 1)
+
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                if not self._put(self.result_queue, (frame_rgb, detections, fall_counter, is_injured), "infer_blocked_s"):
+                    break
+        except Exception as e:
+            # Model load failure, out of memory, a bad frame... end the stream and report it to the reader
+            log.exception("Inference failed for %s", self.video_path)
+            self.error = e
+            self._stop.set()
+        finally:
+            self._put(self.result_queue, _END, "infer_blocked_s")
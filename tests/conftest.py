@@ -0,0 +1,37 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The modules load data/ and outputs/ with paths relative to the project root
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+
+@pytest.fixture
+def synthetic_data(request):
+    """
+    Swaps a synthetic roster into the recommender and restores everything
+    use_data overwrites afterwards. Parametrize indirectly with a dict:
+    n_students / n_events (default 300 / 60) and timed=True to give the
+    events random, overlapping start/end times.
+    """
+    from models.recommender import recommender_hybrid as rh
+    from models.recommender.benchmarks import make_synthetic, use_data
+
+    options = dict(getattr(request, "param", {}))
+    timed = options.pop("timed", False)
+    students, events, attendance = make_synthetic(options.get("n_students", 300), options.get("n_events", 60))
+    if timed:
+        rng = np.random.default_rng(1)
+        start = rng.integers(8 * 60, 18 * 60, len(events))
+        end = start + rng.integers(30, 181, len(events))
+        fmt = lambda m: [f"{h:02d}:{mm:02d}" for h, mm in zip(m // 60, m % 60)]
+        events = events.assign(start_time=fmt(start), end_time=fmt(end))
+
+    saved = (rh.students, rh.events, rh.attendance, rh.participation_logs, rh._cf_model)
+    use_data(students, events, attendance)
+    yield
+    rh.students, rh.events, rh.attendance, rh.participation_logs, rh._cf_model = saved
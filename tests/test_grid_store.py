@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from utils.grid_store import GridStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = GridStore(str(tmp_path / "grid.db"))
+    students = pd.DataFrame({
+        'student_id': range(1, 1001),
+        'name': [f"{'Ana' if i % 2 else 'bob'} {i}" for i in range(1, 1001)],
+        'major': pd.Categorical(['CS', 'Math'] * 500),
+        'GPA': [2.0 + (i % 20) / 10 for i in range(1000)],
+    })
+    store.sync("students", students, "student_id", 1, indexes=['major', 'GPA'], text_columns=['name'])
+    return store
+
+
+def test_prefix_search_uses_nocase_index(store):
+    where, params = store._where("students", {}, "an", "name")
+    plan = store._conn().execute(f"EXPLAIN QUERY PLAN SELECT * FROM students{where}", params).fetchall()
+
+    assert any("USING INDEX students_name_nocase" in row['detail'] for row in plan)
+
+
+def test_prefix_search_is_case_insensitive(store):
+    rows, total = store.page("students", page_size=10, search="ANA 1", search_column="name")
+
+    assert total == 56  # "Ana 1", "Ana 11".."Ana 19", "Ana 101".."Ana 199"
+    assert rows['name'].str.startswith("Ana 1").all()
+    assert rows['student_id'].dtype.kind == 'i'
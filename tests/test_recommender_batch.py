@@ -0,0 +1,28 @@
+import pytest
+
+from models.recommender import recommender_hybrid as rh
+
+# Synthetic roster whose events have real, overlapping start/end times
+timed_events = pytest.mark.parametrize("synthetic_data", [{"timed": True}], indirect=True)
+
+
+@timed_events
+@pytest.mark.parametrize("schedule_mode", ["greedy", "weighted"])
+@pytest.mark.parametrize("top_n", [1, 5, 60])
+def test_batch_matches_per_student_top_n(synthetic_data, schedule_mode, top_n):
+    batch = rh.recommend_all_students(top_n, schedule_mode=schedule_mode)
+
+    for sid in rh.students['student_id'].head(50):
+        one = rh.recommend_top_n(sid, top_n, schedule_mode=schedule_mode)
+        assert batch.loc[batch['student_id'] == sid, 'event_id'].tolist() == one['event_id'].tolist()
+
+
+@timed_events
+def test_batch_drops_overlapping_sports(synthetic_data):
+    batch = rh.recommend_all_students(len(rh.events))
+    sports = batch.merge(rh.events[['event_id', 'start_time', 'end_time']], on='event_id')
+    sports = sports[sports['event_type'] == 'Sports']
+
+    for _, picks in sports.groupby('student_id'):
+        picks = picks.sort_values('end_time')
+        assert (picks['start_time'].iloc[1:].to_numpy() >= picks['end_time'].iloc[:-1].to_numpy()).all()
@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from models.recommender import recommender_hybrid as rh
+
+THREADS = 8
+TOP_N = 5
+
+
+def serve_concurrently(student_ids, rounds=4):
+    # Every student several times, interleaved, to provoke races
+    jobs = [sid for _ in range(rounds) for sid in student_ids]
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        return list(pool.map(lambda sid: (sid, rh.recommend_upcoming_events(sid, TOP_N)), jobs))
+
+
+def test_thread_pool_matches_serial_results(synthetic_data):
+    student_ids = rh.students['student_id'].head(50).tolist()
+    expected = {sid: rh.recommend_upcoming_events(sid, TOP_N) for sid in student_ids}
+
+    answers = serve_concurrently(student_ids)
+
+    assert len(answers) == 4 * len(student_ids)
+    for sid, answer in answers:
+        pd.testing.assert_frame_equal(answer, expected[sid])
+
+
+def test_shared_events_frame_is_never_written(synthetic_data):
+    events_before = rh.events.copy()
+
+    serve_concurrently(rh.students['student_id'].head(50).tolist())
+
+    pd.testing.assert_frame_equal(rh.events, events_before)
+    assert 'score' not in rh.events.columns
+
+
+def test_cf_model_is_built_once_under_concurrency(synthetic_data):
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        models = list(pool.map(lambda _: rh.get_cf_model(), range(4 * THREADS)))
+
+    assert all(m is models[0] for m in models)
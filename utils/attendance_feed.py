@@ -0,0 +1,151 @@
+import io
+import os
+import threading
+from collections import defaultdict
+
+import pandas as pd
+
+ATTENDANCE_CSV = "data/attendance.csv"
+
+
+class CsvTail:
+    """
+    Reads an append-only CSV incrementally.
+
+    Remembers the byte offset of the last complete line it parsed. poll()
+    seeks there, parses only what was appended since and hands the new rows
+    to _ingest(), so a refresh costs O(new rows). A half-written last line is
+    left for the next poll. If the file shrank or the bytes before the offset
+    changed (rewritten / rotated), all state is reset and it starts over.
+    Subclasses keep whatever indexes they need in _reset() / _ingest().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0             # bytes consumed (always at a line boundary)
+        self.rows = 0               # data rows consumed
+        self.columns = None
+        self._last_line = b""       # to notice in-place rewrites cheaply
+
+    def _rewritten(self, f, size):
+        if size < self.offset:
+            return True
+        if not self._last_line:
+            return False
+        f.seek(self.offset - len(self._last_line))
+        return f.read(len(self._last_line)) != self._last_line
+
+    def _empty(self):
+        return pd.DataFrame(columns=self.columns or [])
+
+    def poll(self):
+        """Parses newly appended rows; returns them as a DataFrame (empty if none)."""
+        with self._lock:
+            if not os.path.exists(self.path):
+                return self._empty()
+
+            with open(self.path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if self._rewritten(f, size):
+                    self._reset()
+                if size == self.offset:
+                    return self._empty()
+
+                f.seek(self.offset)
+                data = f.read(size - self.offset)
+
+            # Only complete lines; a partial last line waits for the next poll
+            end = data.rfind(b"\n") + 1
+            if end == 0:
+                return self._empty()
+            data = data[:end]
+            last_line = data.splitlines(keepends=True)[-1]
+
+            if self.columns is None:
+                header, _, data = data.partition(b"\n")
+                self.columns = header.decode().strip().split(",")
+            new_rows = pd.read_csv(io.BytesIO(data), header=None, names=self.columns) if data.strip() else self._empty()
+
+            self.offset += end
+            self._last_line = last_line
+            if not new_rows.empty:
+                self.rows += len(new_rows)
+                self._ingest(new_rows)
+            return new_rows
+
+    def _ingest(self, new_rows):
+        pass
+
+
+class AttendanceFeed(CsvTail):
+    """
+    Tails the check-in CSV instead of re-reading it, keeping the rows plus
+    in-memory indexes (events per student, participants per event) that are
+    updated with every poll.
+    """
+
+    def __init__(self, path=ATTENDANCE_CSV):
+        super().__init__(path)
+
+    def _reset(self):
+        super()._reset()
+        self._chunks = []
+        self._frame = None
+        self._attended = defaultdict(set)   # student_id -> {event_id}
+        self._participants = defaultdict(set)  # event_id -> {student_id}
+
+    def _ingest(self, new_rows):
+        self._chunks.append(new_rows)
+        self._frame = None
+        for student_id, event_id in zip(new_rows['student_id'].tolist(), new_rows['event_id'].tolist()):
+            self._attended[student_id].add(event_id)
+            self._participants[event_id].add(student_id)
+
+    # ---------- Reads ----------
+    def frame(self):
+        """Every row ingested so far as one DataFrame (same object until new rows arrive)."""
+        with self._lock:
+            if self._frame is None:
+                if self._chunks:
+                    self._frame = pd.concat(self._chunks, ignore_index=True) if len(self._chunks) > 1 else self._chunks[0]
+                    self._chunks = [self._frame]
+                else:
+                    self._frame = pd.DataFrame(columns=self.columns or ['student_id', 'event_id'])
+            return self._frame
+
+    def attended(self, student_id):
+        """Events this student checked into."""
+        with self._lock:
+            return set(self._attended.get(student_id, ()))
+
+    def participants(self, event_id):
+        """Students who checked into this event."""
+        with self._lock:
+            return set(self._participants.get(event_id, ()))
+
+    def participant_count(self, event_id):
+        with self._lock:
+            return len(self._participants.get(event_id, ()))
+
+    def participant_counts(self):
+        """event_id -> number of distinct students checked in, as a Series."""
+        with self._lock:
+            return pd.Series({e: len(s) for e, s in self._participants.items()}, name='participants', dtype='int64')
+
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+
+def get_feed(path=ATTENDANCE_CSV):
+    """Process-wide feed per file, already caught up with the file on disk."""
+    with _feeds_lock:
+        if path not in _feeds:
+            _feeds[path] = AttendanceFeed(path)
+        feed = _feeds[path]
+    feed.poll()
+    return feed
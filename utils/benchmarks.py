@@ -0,0 +1,189 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from analysis.aggregates import STUDENT_GROUPS, EVENT_GROUPS, ParticipationAggregates, heatmap_table
+from utils import data_store as ds
+from utils.grid_store import GridStore
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - start
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def scale_attendance(rows, out_dir, seed=0):
+    """Synthetic attendance.csv with `rows` check-ins (IDs drawn from the real ranges)."""
+    real = pd.read_csv(ds.SCHEMAS["attendance"][0])
+    rng = np.random.default_rng(seed)
+    path = os.path.join(out_dir, "attendance.csv")
+    pd.DataFrame({
+        'student_id': rng.integers(1, real['student_id'].max() * 100 + 1, rows),
+        'event_id': rng.integers(1, real['event_id'].max() * 10 + 1, rows),
+    }).to_csv(path, index=False)
+    return path
+
+
+def run_aggregates_benchmark(sizes, new_rows=1000, seed=0):
+    """Overview heatmap input: logs.pivot_table per render vs incrementally maintained aggregates."""
+    rng = np.random.default_rng(seed)
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "participation_logs.csv")
+    try:
+        print(f"{'log rows':>10}{'pivot_table s':>15}{'+' + str(new_rows) + ' rows, incremental s':>30}")
+        for rows in sizes:
+            logs = pd.DataFrame({
+                'student_id': rng.integers(1, 20001, rows),
+                'event_id': rng.integers(1, 501, rows),
+                'event_type': rng.choice(["Event", "Sports"], rows),
+            })
+            logs.to_csv(path, index=False)
+            _, pivot_s = timed(logs.pivot_table, index='student_id', columns='event_id', aggfunc='size', fill_value=0)
+
+            aggregates = ParticipationAggregates(path)
+            aggregates.poll()
+            aggregates.matrix()
+            logs.head(new_rows).to_csv(path, mode="a", header=False, index=False)
+            _, incremental_s = timed(lambda: (aggregates.poll(), aggregates.matrix(), aggregates.type_counts()))
+            print(f"{rows:>10}{pivot_s:>15.3f}{incremental_s:>30.4f}")
+    finally:
+        shutil.rmtree(tmp)
+
+
+def run_heatmap_benchmark(n_students, n_events, rows, seed=0):
+    """Binned heatmap table + matplotlib render at campus scale, for every grouping."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    rng = np.random.default_rng(seed)
+    students = pd.DataFrame({
+        'student_id': np.arange(1, n_students + 1),
+        'major': rng.choice(["Biology", "Business", "CS", "EE", "ME"], n_students),
+        'year': rng.integers(2021, 2026, n_students),
+        'interests': rng.choice(["Art", "Drama", "Music", "Sports", "Tech"], n_students),
+    })
+    events = pd.DataFrame({
+        'event_id': np.arange(1, n_events + 1),
+        'event_type': rng.choice(["Art", "Cultural", "Music", "Sports", "Tech"], n_events),
+        'date': pd.to_datetime("2026-01-01") + pd.to_timedelta(rng.integers(0, 365, n_events), unit="D"),
+    })
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "participation_logs.csv")
+    try:
+        pd.DataFrame({
+            'student_id': rng.integers(1, n_students + 1, rows),
+            'event_id': rng.integers(1, n_events + 1, rows),
+        }).to_csv(path, index=False)
+        aggregates = ParticipationAggregates(path)
+        _, ingest_s = timed(lambda: (aggregates.poll(), aggregates.matrix()))
+        print(f"{n_students} students x {n_events} events, {rows} log rows (ingest {ingest_s:.2f} s, once)")
+
+        for student_group in STUDENT_GROUPS:
+            for event_group in EVENT_GROUPS:
+                table, table_s = timed(heatmap_table, aggregates, students, events, student_group, event_group)
+                def render():
+                    fig, ax = plt.subplots(figsize=(12, 6))
+                    sns.heatmap(table, cmap="YlGnBu", ax=ax)
+                    fig.savefig(os.path.join(tmp, "heatmap.png"))
+                    plt.close(fig)
+                _, render_s = timed(render)
+                print(f"  {student_group:<11} x {event_group:<10}: {table.shape[0]:>3} x {table.shape[1]:<3} "
+                      f"table {table_s:.3f} s + render {render_s:.3f} s")
+    finally:
+        shutil.rmtree(tmp)
+
+
+def run_grid_benchmark(n_students, page_size=25, seed=0):
+    """Students grid: whole frame sorted + serialized per rerun vs one indexed page query."""
+    rng = np.random.default_rng(seed)
+    students = pd.DataFrame({
+        'student_id': np.arange(1, n_students + 1, dtype='int32'),
+        'name': [f"Student {i}" for i in rng.permutation(n_students)],
+        'year': rng.integers(2021, 2026, n_students).astype('int16'),
+        'major': pd.Categorical(rng.choice(["Biology", "Business", "CS", "EE", "ME"], n_students)),
+        'GPA': rng.uniform(2.0, 4.0, n_students).astype('float32'),
+    })
+    tmp = tempfile.mkdtemp()
+    try:
+        store = GridStore(os.path.join(tmp, "grid_store.db"))
+        _, sync_s = timed(store.sync, "students", students, 'student_id', 1,
+                          indexes=['name', 'year', 'major', 'GPA'], text_columns=['name'])
+        payload, full_s = timed(lambda: students.sort_values('name').to_json(orient='records'))
+        print(f"{n_students} students (sync {sync_s:.2f} s, once per data version)")
+        print(f"  full frame sorted + serialized: {full_s:.4f} s, {len(payload) / 1e6:.1f} MB to the browser")
+
+        last = -(-n_students // page_size)
+        for label, kwargs in [("first page by name", dict(page=1, sort='name')),
+                              ("last page by GPA desc", dict(page=last, sort='GPA', descending=True)),
+                              ("major = CS, name prefix", dict(page=1, sort='name', filters={'major': 'CS'},
+                                                               search="Student 12", search_column='name'))]:
+            (rows, total), page_s = timed(store.page, "students", page_size=page_size, **kwargs)
+            size = len(rows.to_json(orient='records'))
+            print(f"  {label:<24}: {page_s:.4f} s, {len(rows)} of {total} rows, {size / 1e3:.1f} kB")
+    finally:
+        shutil.rmtree(tmp)
+
+
+def run_load_benchmark(names, repeat=5, columns=None, store_dir=None):
+    print(f"{'dataset':<20}{'rows':>10}{'csv s':>10}{'typed csv s':>13}{'feather s':>11}{'csv MB':>9}{'typed MB':>10}")
+    for name in names:
+        source = ds.SCHEMAS[name][0]
+        if not os.path.exists(source):
+            continue
+        ds.rebuild(name, store_dir)
+
+        raw, csv_s = timed(lambda: [pd.read_csv(source, usecols=columns) for _ in range(repeat)])
+        _, typed_s = timed(lambda: [ds.read_csv_typed(name, columns) for _ in range(repeat)])
+        typed, feather_s = timed(lambda: [ds.load(name, columns, store_dir) for _ in range(repeat)])
+        raw, typed = raw[0], typed[0]
+        print(f"{name:<20}{len(raw):>10}{csv_s / repeat:>10.4f}{typed_s / repeat:>13.4f}{feather_s / repeat:>11.4f}"
+              f"{memory_mb(raw):>9.2f}{memory_mb(typed):>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Data layer benchmarks (CSV vs Feather loads, Overview aggregates)")
+    parser.add_argument("--datasets", nargs="+", default=list(ds.SCHEMAS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--attendance-rows", type=int, help="benchmark a synthetic attendance file of this size")
+    parser.add_argument("--columns", nargs="+", help="only load these columns (projection)")
+    parser.add_argument("--aggregates", type=int, nargs="+", metavar="ROWS",
+                        help="benchmark the Overview aggregates on participation logs of these sizes")
+    parser.add_argument("--heatmap", type=int, nargs=2, metavar=("STUDENTS", "EVENTS"),
+                        help="benchmark the binned participation heatmap at this scale")
+    parser.add_argument("--heatmap-rows", type=int, default=2_000_000, help="log rows for --heatmap")
+    parser.add_argument("--grid", type=int, metavar="STUDENTS",
+                        help="benchmark server-side grid paging on this many synthetic students")
+    args = parser.parse_args()
+
+    if args.aggregates:
+        run_aggregates_benchmark(args.aggregates)
+    elif args.heatmap:
+        run_heatmap_benchmark(*args.heatmap, args.heatmap_rows)
+    elif args.grid:
+        run_grid_benchmark(args.grid)
+    elif ds.feather is None:
+        raise SystemExit("pyarrow is not installed (pip install pyarrow)")
+    elif args.attendance_rows:
+        tmp = tempfile.mkdtemp()
+        schemas = ds.SCHEMAS
+        try:
+            # Synthetic source and a temporary store: outputs/data_store is never touched
+            ds.SCHEMAS = dict(schemas, attendance=(scale_attendance(args.attendance_rows, tmp), schemas["attendance"][1]))
+            run_load_benchmark(["attendance"], args.repeat, args.columns, store_dir=tmp)
+        finally:
+            ds.SCHEMAS = schemas
+            shutil.rmtree(tmp)
+    else:
+        run_load_benchmark(args.datasets, args.repeat, args.columns)
@@ -0,0 +1,169 @@
+import os
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # CSV fallback below still applies the schemas
+    pa = feather = None
+
+STORE_DIR = "outputs/data_store"
+
+# Bump when a schema changes so existing Feather files are rebuilt
+STORE_VERSION = 2
+
+# CSV source + column dtypes for every dataset. IDs are int32, low-cardinality
+# text is categorical.
+SCHEMAS = {
+    "students": ("data/students.csv", {
+        "student_id": "int32", "name": "string", "year": "int16", "major": "category",
+        "GPA": "float32", "interests": "category",
+    }),
+    "events": ("data/events.csv", {
+        "event_id": "int32", "event_name": "string", "event_type": "category", "date": "datetime64[ns]",
+        "location": "category", "expected_attendance": "int32",
+    }),
+    "attendance": ("data/attendance.csv", {
+        "student_id": "int32", "event_id": "int32",
+    }),
+    "participation_logs": ("data/participation_logs.csv", {
+        "student_id": "int32", "event_id": "int32", "event_type": "category",
+        "participation_date": "datetime64[ns]", "role": "category",
+    }),
+    "volunteers": ("data/volunteers.csv", {
+        "student_id": "int32", "available": "bool", "skill": "category", "rating": "float32",
+    }),
+    "recommendations": ("outputs/hybrid_sports_recommendations.csv", {
+        "event_id": "int32", "event_name": "string", "event_type": "category", "score": "float64",
+        "predicted_turnout": "int32", "injuries": "int32",
+    }),
+    # Long (event_id, student_id) tables exploded from the "[1, 2, 3]" list columns
+    "event_participants": ("outputs/hybrid_sports_recommendations.csv", {
+        "event_id": "int32", "student_id": "int32",
+    }),
+    "event_volunteers": ("outputs/hybrid_sports_recommendations.csv", {
+        "event_id": "int32", "student_id": "int32",
+    }),
+}
+
+# Derived long table -> list column of its source CSV
+LIST_COLUMNS = {
+    "event_participants": "actual_participants",
+    "event_volunteers": "assigned_volunteers",
+}
+
+_lock = threading.Lock()
+
+
+def explode_ids(df, list_col, key='event_id'):
+    """
+    "[1, 2, 3]" strings -> one (key, student_id) row per id, with vectorized
+    string ops instead of a literal_eval per row. Empty / missing lists give no rows.
+    """
+    ids = df[list_col].fillna("").astype(str).str.strip("[] ").str.split(",")
+    long = pd.DataFrame({key: df[key].to_numpy(), 'student_id': ids}).explode('student_id')
+    long['student_id'] = pd.to_numeric(long['student_id'].str.strip(), errors='coerce')
+    return long.dropna(subset=['student_id']).astype({'student_id': 'int64'}).reset_index(drop=True)
+
+
+def read_csv_typed(name, columns=None):
+    """Parses a dataset's CSV with its schema applied (the slow path)."""
+    path, schema = SCHEMAS[name]
+    if name in LIST_COLUMNS:
+        df = explode_ids(pd.read_csv(path, usecols=['event_id', LIST_COLUMNS[name]]), LIST_COLUMNS[name])
+    else:
+        # List columns live in their own long tables
+        df = pd.read_csv(path, usecols=lambda c: c in schema)
+    if columns is not None:
+        df = df[list(columns)]
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        if dtype.startswith("datetime"):
+            df[col] = pd.to_datetime(df[col])
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def store_path(name, store_dir=None):
+    # STORE_DIR is read at call time so it can be repointed (e.g. by the benchmarks)
+    return os.path.join(store_dir or STORE_DIR, f"{name}.v{STORE_VERSION}.feather")
+
+
+def _is_stale(name, store_dir):
+    # rebuild() stamps each Feather file with its CSV's mtime, so any difference
+    # (a newer CSV, or a file built from some other source) means rebuild
+    source = SCHEMAS[name][0]
+    target = store_path(name, store_dir)
+    return not os.path.exists(target) or os.stat(source).st_mtime_ns != os.stat(target).st_mtime_ns
+
+
+def rebuild(name, store_dir=None):
+    """Converts one CSV into an uncompressed Feather file (uncompressed so it can be memory-mapped)."""
+    source_mtime = os.stat(SCHEMAS[name][0]).st_mtime_ns  # before reading: a write mid-rebuild stays stale
+    df = read_csv_typed(name)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    os.makedirs(store_dir or STORE_DIR, exist_ok=True)
+    target = store_path(name, store_dir)
+    tmp = target + ".tmp"
+    feather.write_feather(table, tmp, compression="uncompressed")
+    os.utime(tmp, ns=(source_mtime, source_mtime))
+    os.replace(tmp, target)
+    return target
+
+
+def load(name, columns=None, store_dir=None):
+    """
+    Typed DataFrame for a dataset. Reads the Feather copy memory-mapped and
+    only the requested columns; rebuilds it first if the CSV is newer.
+    Without pyarrow, falls back to parsing the CSV with the same dtypes.
+    """
+    if feather is None:
+        return read_csv_typed(name, columns)
+    with _lock:
+        if _is_stale(name, store_dir):
+            rebuild(name, store_dir)
+    table = feather.read_table(store_path(name, store_dir), columns=columns, memory_map=True)
+    return table.to_pandas()
+
+
+def load_recommendations(store_dir=None):
+    """
+    The hybrid recommendations plus their participants and volunteers as long
+    (event_id, student_id) tables. current_participants / volunteer_count are
+    groupby counts over those tables. Returns (recs, participants, volunteers).
+    """
+    recs = load("recommendations", store_dir=store_dir)
+    participants = load("event_participants", store_dir=store_dir)
+    volunteers = load("event_volunteers", store_dir=store_dir)
+    for col, long in (('current_participants', participants), ('volunteer_count', volunteers)):
+        counts = long.groupby('event_id').size()
+        recs[col] = recs['event_id'].map(counts).fillna(0).astype('int32')
+    return recs, participants, volunteers
+
+
+def rebuild_all(store_dir=None, force=False):
+    """Refreshes every stale (or, with force, every) Feather file. Returns the rebuilt names."""
+    rebuilt = []
+    for name, (source, _) in SCHEMAS.items():
+        if os.path.exists(source) and (force or _is_stale(name, store_dir)):
+            rebuild(name, store_dir)
+            rebuilt.append(name)
+    return rebuilt
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert the CSV datasets into typed Feather files")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the Feather files are up to date")
+    parser.add_argument("--store-dir", default=STORE_DIR, help="where to write the Feather files")
+    args = parser.parse_args()
+
+    if feather is None:
+        raise SystemExit("pyarrow is not installed (pip install pyarrow)")
+    rebuilt = rebuild_all(args.store_dir, force=args.force)
+    print(f"Rebuilt: {', '.join(rebuilt) if rebuilt else 'nothing (all up to date)'} -> {args.store_dir}")
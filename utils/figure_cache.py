@@ -0,0 +1,194 @@
+import functools
+import hashlib
+import inspect
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+FIGURE_CACHE_DIR = "outputs/figure_cache"
+
+# Same savefig defaults st.pyplot uses, so cached charts look identical
+SAVEFIG_DEFAULTS = {"bbox_inches": "tight", "dpi": 200}
+
+
+def fingerprint(*objs):
+    """
+    Content hash of the data a chart is drawn from. DataFrames / Series are
+    hashed by values, index and column names; anything else by its repr.
+    """
+    h = hashlib.sha1()
+    for obj in objs:
+        if isinstance(obj, (pd.DataFrame, pd.Series)):
+            h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+            names = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+            h.update(repr((list(names), obj.index.names, obj.shape)).encode())
+        else:
+            h.update(repr(obj).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(draw):
+    """
+    Hash of the drawing code (the whole module, so helpers it calls count too)
+    plus the matplotlib / seaborn versions: editing a chart or upgrading a
+    library gives new keys instead of serving old PNGs from disk.
+    """
+    import matplotlib
+    try:
+        import seaborn
+        seaborn_version = seaborn.__version__
+    except ImportError:
+        seaborn_version = None
+    module = inspect.getmodule(draw)
+    try:
+        source = inspect.getsource(module) if module is not None else inspect.getsource(draw)
+    except (OSError, TypeError):
+        source = getattr(getattr(draw, "__code__", None), "co_code", b"").hex()
+    return fingerprint(source, matplotlib.__version__, seaborn_version)
+
+
+class FigureCache:
+    """
+    Rendered chart bytes (PNG / SVG) keyed by the drawing function (name,
+    source and library versions), a fingerprint of its data and its plot
+    parameters. A hit is a dict lookup; only a miss builds the matplotlib
+    figure. Least recently used entries are evicted once the total size
+    passes max_bytes.
+
+    With cache_dir the entries are also kept on disk (same size bound, LRU by
+    file mtime), so saving the same charts again skips the rendering.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, cache_dir=None):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()   # key -> bytes, oldest first
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(draw, data, params, fmt):
+        name = f"{draw.__module__}.{draw.__qualname__}"
+        return fingerprint(name, code_version(draw), fingerprint(*data), sorted(params.items()), fmt)
+
+    def _path(self, key, fmt):
+        return os.path.join(self.cache_dir, f"{key}.{fmt}")
+
+    # ---------- Memory tier ----------
+    def _get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        return None
+
+    def _put(self, key, blob):
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = blob
+            self._size += len(blob)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, old = self._entries.popitem(last=False)
+                self._size -= len(old)
+
+    # ---------- Disk tier ----------
+    def _read_disk(self, key, fmt):
+        if not self.cache_dir:
+            return None
+        path = self._path(key, fmt)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # mark as recently used
+        return blob
+
+    def _write_disk(self, key, fmt, blob):
+        if not self.cache_dir:
+            return
+        path = self._path(key, fmt)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, path)
+
+        # Evict the least recently used files beyond max_bytes
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, old in sorted(files):
+            if total <= self.max_bytes or old == path:
+                continue
+            os.remove(old)
+            total -= size
+
+    # ---------- Public ----------
+    def render(self, draw, *data, fmt="png", **params):
+        """
+        Bytes of the chart draw(*data, **params) returns (a matplotlib Figure),
+        rendered only if this function / data / parameter combination is new.
+        """
+        key = self.key(draw, data, params, fmt)
+        blob = self._get(key)
+        if blob is None:
+            blob = self._read_disk(key, fmt)
+            if blob is not None:
+                self._put(key, blob)
+        if blob is not None:
+            self.hits += 1
+            return blob
+
+        self.misses += 1
+        import matplotlib.pyplot as plt
+
+        fig = draw(*data, **params)
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, **SAVEFIG_DEFAULTS)
+        plt.close(fig)
+        blob = buf.getvalue()
+        self._put(key, blob)
+        self._write_disk(key, fmt, blob)
+        return blob
+
+    def save(self, path, draw, *data, fmt="png", **params):
+        """Writes the rendered chart to `path` (rendering only on a cache miss)."""
+        blob = self.render(draw, *data, fmt=fmt, **params)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(blob)
+        return path
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide in-memory cache (shared by all dashboard sessions)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FigureCache()
+        return _cache
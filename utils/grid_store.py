@@ -0,0 +1,197 @@
+import json
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+DEFAULT_DB = "outputs/grid_store.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name        TEXT PRIMARY KEY,
+    version     TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    columns     TEXT NOT NULL
+);
+"""
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _column_type(series, nocase=False):
+    # Declared types give the columns real affinities: TEXT is what lets the
+    # LIKE prefix search use the NOCASE index instead of scanning the table.
+    # Mixed / non-string objects get no type, so their values are stored as they are.
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    if pd.api.types.is_numeric_dtype(series):
+        return "REAL"
+    if pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+        return "TEXT COLLATE NOCASE" if nocase else "TEXT"
+    return ""
+
+
+def _plain(value):
+    # numpy scalars (e.g. an id taken from a DataFrame) -> Python values sqlite3 accepts
+    return value.item() if hasattr(value, "item") else value
+
+
+class GridStore:
+    """
+    Indexed SQLite copies of the tables the dashboard shows in grids, so a
+    grid only ever pulls one page of rows: filtering, sorting and paging run
+    as a single query (WHERE ... ORDER BY ... LIMIT/OFFSET) against indexes
+    instead of sending the whole DataFrame to the browser.
+
+    sync() reloads a table only when its data version changed; page() and
+    lookup() are the reads.
+    """
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self):
+        # sqlite3 connections can't be shared between threads; keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _meta(self, name):
+        row = self._conn().execute("SELECT * FROM meta WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(f"grid table {name!r} has not been synced")
+        return row['key'], json.loads(row['columns'])
+
+    # ---------- Writes ----------
+    def sync(self, name, df, key, version, indexes=(), text_columns=()):
+        """
+        Replaces table `name` with df if `version` differs from the stored one.
+        `key` gets a unique index, every column in `indexes` a plain one (for
+        sort / equality filters) and every column in `text_columns` is
+        declared TEXT COLLATE NOCASE with a NOCASE index (for prefix search).
+        Returns True if the table was rebuilt.
+        """
+        version = json.dumps(version, default=str)
+        conn = self._conn()
+
+        def current():
+            row = conn.execute("SELECT version FROM meta WHERE name = ?", (name,)).fetchone()
+            return row['version'] if row is not None else None
+
+        if current() == version:
+            return False
+        with self._write_lock:
+            if current() == version:  # another session synced it meanwhile
+                return False
+            # Categoricals / extension types become plain values SQLite understands
+            data = df.astype({c: object for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])})
+            staging = f"{name}__new"
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(staging)}")
+                cols = ", ".join(f"{_quote(c)} {_column_type(data[c], c in text_columns)}".rstrip() for c in data.columns)
+                conn.execute(f"CREATE TABLE {_quote(staging)} ({cols})")
+                marks = ", ".join("?" for _ in data.columns)
+                conn.executemany(f"INSERT INTO {_quote(staging)} VALUES ({marks})",
+                                 data.astype(object).where(data.notna(), None).itertuples(index=False, name=None))
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(name)}")
+                conn.execute(f"ALTER TABLE {_quote(staging)} RENAME TO {_quote(name)}")
+                conn.execute(f"CREATE UNIQUE INDEX {_quote(f'{name}_{key}')} ON {_quote(name)} ({_quote(key)})")
+                for col in indexes:
+                    conn.execute(f"CREATE INDEX {_quote(f'{name}_{col}')} ON {_quote(name)} ({_quote(col)})")
+                for col in text_columns:
+                    conn.execute(f"CREATE INDEX {_quote(f'{name}_{col}_nocase')} "
+                                 f"ON {_quote(name)} ({_quote(col)} COLLATE NOCASE)")
+                conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?, ?, ?)",
+                             (name, version, key, json.dumps(list(data.columns))))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return True
+
+    # ---------- Reads ----------
+    def columns(self, name):
+        return self._meta(name)[1]
+
+    def _where(self, name, filters, search, search_column):
+        _, columns = self._meta(name)
+        clauses, params = [], []
+        for col, value in (filters or {}).items():
+            if col not in columns:
+                raise ValueError(f"unknown column {col!r}")
+            clauses.append(f"{_quote(col)} = ?")
+            params.append(_plain(value))
+        if search:
+            if search_column not in columns:
+                raise ValueError(f"unknown column {search_column!r}")
+            # Prefix match so the NOCASE index can be used (LIKE is case-insensitive)
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append(f"{_quote(search_column)} LIKE ? ESCAPE '\\'")
+            params.append(escaped + "%")
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def page(self, name, page=1, page_size=25, sort=None, descending=False, filters=None,
+             search=None, search_column=None):
+        """
+        One page of rows (1-based page number) plus the total number of rows
+        matching `filters` (column -> value) and the `search` prefix on
+        `search_column`. Ties in the sort column fall back to the key so
+        pages never overlap. Returns (DataFrame, total).
+        """
+        key, columns = self._meta(name)
+        where, params = self._where(name, filters, search, search_column)
+        total = self._conn().execute(f"SELECT COUNT(*) FROM {_quote(name)}{where}", params).fetchone()[0]
+
+        direction = "DESC" if descending else "ASC"
+        order = [f"{_quote(key)} {direction}"]
+        if sort is not None and sort != key:
+            if sort not in columns:
+                raise ValueError(f"unknown column {sort!r}")
+            order.insert(0, f"{_quote(sort)} {direction}")
+        offset = (max(int(page), 1) - 1) * int(page_size)
+        rows = self._conn().execute(
+            f"SELECT * FROM {_quote(name)}{where} ORDER BY {', '.join(order)} LIMIT ? OFFSET ?",
+            params + [int(page_size), offset],
+        ).fetchall()
+        return pd.DataFrame([tuple(r) for r in rows], columns=columns), total
+
+    def lookup(self, name, key_value):
+        """One row by its key (unique-index lookup) as a dict, or None."""
+        key, _ = self._meta(name)
+        row = self._conn().execute(f"SELECT * FROM {_quote(name)} WHERE {_quote(key)} = ?",
+                                   (_plain(key_value),)).fetchone()
+        return dict(row) if row is not None else None
+
+    def distinct(self, name, column):
+        """Sorted distinct values of an indexed column (filter options)."""
+        if column not in self.columns(name):
+            raise ValueError(f"unknown column {column!r}")
+        rows = self._conn().execute(
+            f"SELECT DISTINCT {_quote(column)} FROM {_quote(name)} WHERE {_quote(column)} IS NOT NULL ORDER BY 1"
+        ).fetchall()
+        return [r[0] for r in rows]
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=DEFAULT_DB):
+    """Process-wide GridStore per database file."""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = GridStore(path)
+        return _stores[path]